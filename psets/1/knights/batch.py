@@ -0,0 +1,86 @@
+import json
+import multiprocessing
+import sys
+import time
+
+from logic import *
+from knowledge import KnowledgeBase
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python batch.py puzzles.txt [puzzles.txt ...]")
+
+    start = time.perf_counter()
+    solved = 0
+
+    # Solve puzzles in parallel, writing results in input order as they finish
+    with multiprocessing.Pool() as pool:
+        results = pool.imap(solve, read_puzzles(sys.argv[1:]), chunksize=64)
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+            solved += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"Solved {solved} puzzles in {elapsed:.2f}s", file=sys.stderr)
+
+
+def read_puzzles(filenames):
+    """
+    Lazily yield puzzles from text files as (filename, name, lines) tuples.
+    Each puzzle is a block of formulas, one sentence per line, separated
+    from the next by a blank line. A "# name" line names the puzzle; any
+    other line starting with "#" is a comment.
+    """
+    for filename in filenames:
+        with open(filename, encoding="utf-8") as f:
+            name = None
+            lines = []
+            for line in f:
+                line = line.strip()
+
+                # A blank line ends the current puzzle
+                if not line:
+                    if lines:
+                        yield filename, name, lines
+                    name = None
+                    lines = []
+                elif line.startswith("#"):
+                    if name is None and not lines:
+                        name = line[1:].strip()
+                else:
+                    lines.append(line)
+
+            if lines:
+                yield filename, name, lines
+
+
+def solve(puzzle):
+    """
+    Parse and solve a single puzzle, returning a dictionary with the
+    literals its knowledge entails and the time taken.
+    """
+    filename, name, lines = puzzle
+    start = time.perf_counter()
+
+    result = {"file": filename, "puzzle": name}
+    try:
+        symbols = dict()
+        knowledge = KnowledgeBase(*(parse(line, symbols) for line in lines))
+        satisfiable = knowledge.satisfiable()
+        entailed = knowledge.entailed_literals(
+            [symbols[symbol] for symbol in sorted(symbols)]
+        )
+        result["satisfiable"] = satisfiable
+        result["entailed"] = sorted(literal.formula() for literal in entailed)
+    except ValueError as error:
+        result["error"] = str(error)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import multiprocessing
+import resource
+import sys
+import time
+
+import generators
+from logic import *
+from knowledge import KnowledgeBase
+from simplify import simplify
+
+TIMEOUT = 10
+
+# Result of a backend that raised instead of answering
+FAILED = "failed"
+
+# Entailing a contradiction means the knowledge is unsatisfiable
+UNSATISFIABLE = Constant(False)
+
+# Puzzle families as (name, generator, sizes, query)
+FAMILIES = [
+    ("knights", lambda n: generators.knights(n, seed=n), [4, 6, 8, 32, 128],
+     Symbol("Person 0 is a Knight")),
+    ("pigeonhole", generators.pigeonhole, [3, 4, 5, 6, 7],
+     UNSATISFIABLE),
+    ("3-SAT", lambda n: generators.random_3sat(n, seed=n), [8, 12, 16, 50,
+                                                             100, 150],
+     UNSATISFIABLE),
+    ("queens", generators.queens, [3, 4, 5, 6, 8, 12], UNSATISFIABLE),
+]
+
+
+def check_model_check(knowledge, query):
+    return model_check(knowledge, query)
+
+
+def check_knowledge_base(knowledge, query):
+    return KnowledgeBase(knowledge).entails(query)
+
+
+def check_simplified(knowledge, query):
+    simplified = simplify(knowledge, protected=query.symbols())
+    return model_check(simplified.sentence, simplified.query(query))
+
+
+# Backends deciding whether knowledge entails query
+BACKENDS = [
+    ("model_check", check_model_check),
+    ("simplify+model_check", check_simplified),
+    ("KnowledgeBase", check_knowledge_base),
+]
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [timeout]")
+    timeout = float(sys.argv[1]) if len(sys.argv) == 2 else TIMEOUT
+
+    print(f"{'family':<12}{'n':>5}  {'backend':<22}"
+          f"{'result':>8}{'seconds':>10}{'MB':>8}  agree")
+
+    for family, generate, sizes, query in FAMILIES:
+        for n in sizes:
+            knowledge = generate(n)
+
+            rows = []
+            for backend, check in BACKENDS:
+                rows.append((backend, run(check, knowledge, query, timeout)))
+
+            # Every backend that finished should give the same answer
+            answers = {result for _, (result, _, _) in rows
+                       if result is not None and result != FAILED}
+            agree = "yes" if len(answers) <= 1 else "NO"
+
+            for backend, (result, seconds, memory) in rows:
+                shown = "timeout" if result is None else str(result)
+                memory = "-" if memory is None else f"{memory:.1f}"
+                print(f"{family:<12}{n:>5}  {backend:<22}"
+                      f"{shown:>8}{seconds:>10.3f}{memory:>8}  {agree}")
+
+
+def run(check, knowledge, query, timeout):
+    """
+    Runs a backend in a separate process, so it can be stopped once it
+    exceeds `timeout` seconds.
+    Returns (result, seconds, peak memory in MB), with result None on timeout
+    and FAILED if the backend raised.
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=measure, args=(queue, check, knowledge, query)
+    )
+    start = time.perf_counter()
+    process.start()
+    process.join(timeout)
+
+    if process.is_alive():
+        process.kill()
+        process.join()
+        return None, time.perf_counter() - start, None
+
+    # A backend that crashed reports nothing
+    if process.exitcode:
+        return FAILED, time.perf_counter() - start, None
+    return queue.get()
+
+
+def measure(queue, check, knowledge, query):
+    """Runs a backend and reports its result, time and peak memory."""
+    start = time.perf_counter()
+    result = check(knowledge, query)
+    seconds = time.perf_counter() - start
+
+    # Peak resident set size is reported in kilobytes on Linux
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((result, seconds, memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import itertools
+import random
+
+from logic import *
+
+
+def knights(n, seed=None):
+    """
+    Returns the knowledge of a knights and knaves puzzle with `n` people.
+    Every person makes one random statement about the others, chosen so
+    that a hidden assignment of knights and knaves is consistent with it.
+    """
+    rng = random.Random(seed)
+    knight = [Symbol(f"Person {i} is a Knight") for i in range(n)]
+    knave = [Symbol(f"Person {i} is a Knave") for i in range(n)]
+    hidden = {symbol.name: rng.random() < 0.5 for symbol in knight}
+    hidden.update({
+        knave[i].name: not hidden[knight[i].name] for i in range(n)
+    })
+
+    knowledge = And()
+    for i in range(n):
+
+        # Basic rule, one is either a knight or a knave but not both
+        knowledge.add(Or(knight[i], knave[i]))
+        knowledge.add(Not(And(knight[i], knave[i])))
+
+        # Statement about one or two other people
+        j, k = rng.randrange(n), rng.randrange(n)
+        statement = rng.choice([
+            knight[j],
+            knave[j],
+            And(knight[j], knave[k]),
+            Or(knave[j], knave[k]),
+            Biconditional(knight[j], knight[k]),
+        ])
+
+        # Knights tell the truth and knaves lie
+        if statement.evaluate(hidden) != hidden[knight[i].name]:
+            statement = Not(statement)
+        knowledge.add(Implication(knight[i], statement))
+        knowledge.add(Implication(knave[i], Not(statement)))
+
+    return knowledge
+
+
+def pigeonhole(n):
+    """
+    Returns the knowledge that `n + 1` pigeons sit in `n` holes with at
+    most one pigeon per hole, which is unsatisfiable.
+    """
+    sits = [[Symbol(f"Pigeon {i} in hole {j}") for j in range(n)]
+            for i in range(n + 1)]
+
+    knowledge = And()
+
+    # Every pigeon sits in some hole
+    for i in range(n + 1):
+        knowledge.add(Or(*sits[i]))
+
+    # No two pigeons share a hole
+    for j in range(n):
+        for i, k in itertools.combinations(range(n + 1), 2):
+            knowledge.add(Not(And(sits[i][j], sits[k][j])))
+
+    return knowledge
+
+
+def random_3sat(n, ratio=4.26, seed=None):
+    """
+    Returns a random 3-SAT formula over `n` symbols with `ratio * n`
+    clauses, which at the default ratio sits at the phase transition
+    where formulas are hardest.
+    """
+    rng = random.Random(seed)
+    symbols = [Symbol(f"X{i}") for i in range(n)]
+
+    knowledge = And()
+    for _ in range(round(ratio * n)):
+        clause = [
+            symbol if rng.random() < 0.5 else Not(symbol)
+            for symbol in rng.sample(symbols, min(3, n))
+        ]
+        knowledge.add(Or(*clause))
+
+    return knowledge
+
+
+def queens(n):
+    """
+    Returns the knowledge that `n` queens sit on an `n` by `n` board
+    without attacking each other.
+    """
+    queen = [[Symbol(f"Queen at {i},{j}") for j in range(n)]
+             for i in range(n)]
+    cells = [(i, j) for i in range(n) for j in range(n)]
+
+    knowledge = And()
+
+    # Every row has a queen
+    for i in range(n):
+        knowledge.add(Or(*queen[i]))
+
+    # No two queens share a row, column or diagonal
+    for (i, j), (k, l) in itertools.combinations(cells, 2):
+        if i == k or j == l or abs(i - k) == abs(j - l):
+            knowledge.add(Not(And(queen[i][j], queen[k][l])))
+
+    return knowledge
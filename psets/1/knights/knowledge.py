@@ -0,0 +1,320 @@
+from logic import *
+from solver import Solver
+
+
+class KnowledgeBase():
+    """
+    Knowledge base that keeps its sentences preprocessed as clauses
+    inside an incremental solver, so that many entailment queries can be
+    answered without re-enumerating every model of the knowledge.
+    """
+
+    def __init__(self, *sentences):
+        self.solver = Solver()
+
+        # Solver variable used for each symbol name, and the reverse
+        self.variables = dict()
+        self.names = dict()
+
+        # Literal standing for each sentence already encoded
+        self.definitions = dict()
+
+        # Clauses encoding the sentences, without anything learned later
+        self.clauses = []
+
+        # Sentences added so far
+        self.sentences = []
+
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence to the knowledge base."""
+        Sentence.validate(sentence)
+        self.sentences.append(sentence)
+        self.assert_sentence(sentence)
+
+    def symbols(self):
+        """Returns a set of all symbols in the knowledge base."""
+        return set(self.variables)
+
+    def satisfiable(self):
+        """Checks if some model makes every sentence true."""
+        return self.solver.solve()
+
+    def entails(self, query):
+        """Checks if knowledge base entails query."""
+        Sentence.validate(query)
+
+        # Knowledge entails query if it is unsatisfiable together with ¬query
+        literal = self.encode(query)
+        return not self.solver.solve([-literal])
+
+    def entailed_literals(self, symbols=None):
+        """
+        Returns the set of literals (symbols or their negations) entailed by
+        the knowledge base, among `symbols` or every symbol it mentions.
+        """
+        if symbols is None:
+            symbols = [Symbol(name) for name in self.variables]
+        variables = {self.variable(symbol.name): symbol for symbol in symbols}
+
+        # Inconsistent knowledge entails everything
+        if not self.solver.solve():
+            return (set(variables.values())
+                    | {Not(symbol) for symbol in variables.values()})
+
+        # Only values shared by every model found so far can be entailed
+        model = self.solver.model
+        candidates = {variable: model[variable] for variable in variables}
+
+        entailed = set()
+        while candidates:
+            variable, value = candidates.popitem()
+            literal = variable if value else -variable
+
+            # A model with the opposite value rules out more candidates
+            if self.solver.solve([-literal]):
+                model = self.solver.model
+                candidates = {
+                    other: value for other, value in candidates.items()
+                    if model[other] == value
+                }
+                continue
+
+            # Keep the entailed literal as a fact for later queries
+            self.solver.add_clause([literal])
+            symbol = variables[variable]
+            entailed.add(symbol if value else Not(symbol))
+
+        return entailed
+
+    def count_models(self):
+        """
+        Returns the number of models of the knowledge base, counted over
+        every symbol it has seen (including symbols only used in queries).
+        """
+
+        # Definition variables are fixed by the symbols, so they add no models
+        variables = set(self.names)
+        for clause in self.clauses:
+            variables.update(abs(literal) for literal in clause)
+        return count_clauses(self.clauses, variables)
+
+    def models(self, symbols=None):
+        """
+        Lazily yields every model of the knowledge base as a dictionary
+        from symbol name to truth value, over `symbols` or every symbol.
+        """
+        if symbols is None:
+            symbols = [Symbol(name) for name in self.variables]
+        variables = {self.variable(symbol.name): symbol.name
+                     for symbol in symbols}
+
+        # Blocking clauses only apply while the selector is assumed true
+        selector = self.solver.new_variable()
+        try:
+            while self.solver.solve([selector]):
+                model = self.solver.model
+                yield {name: model[variable]
+                       for variable, name in variables.items()}
+
+                # Rule out this model before looking for the next one
+                self.solver.add_clause(
+                    [-variable if model[variable] else variable
+                     for variable in variables] + [-selector]
+                )
+        finally:
+
+            # Retire the blocking clauses for good
+            self.solver.add_clause([-selector])
+
+    def add_clause(self, clause):
+        """Adds a clause encoding part of the knowledge."""
+        self.clauses.append(clause)
+        self.solver.add_clause(clause)
+
+    def variable(self, name):
+        """Returns the solver variable standing for a symbol name."""
+        if name not in self.variables:
+            variable = self.solver.new_variable()
+            self.variables[name] = variable
+            self.names[variable] = name
+        return self.variables[name]
+
+    def assert_sentence(self, sentence):
+        """Adds clauses forcing `sentence` to be true."""
+
+        # Conjunctions are split and disjunctions become a single clause
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.assert_sentence(conjunct)
+        elif isinstance(sentence, Or):
+            self.add_clause(
+                [self.encode(disjunct) for disjunct in sentence.disjuncts]
+            )
+        else:
+            self.add_clause([self.encode(sentence)])
+
+    def encode(self, sentence):
+        """
+        Returns a literal equivalent to `sentence`, adding clauses that
+        define a new variable for each compound sentence (Tseitin encoding).
+        """
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.encode(sentence.operand)
+        if sentence in self.definitions:
+            return self.definitions[sentence]
+
+        if isinstance(sentence, Constant):
+            literal = self.define_and([])
+            if not sentence.value:
+                literal = -literal
+        elif isinstance(sentence, And):
+            literals = [self.encode(c) for c in sentence.conjuncts]
+            literal = self.define_and(literals)
+        elif isinstance(sentence, Or):
+            literals = [self.encode(d) for d in sentence.disjuncts]
+            literal = -self.define_and([-literal for literal in literals])
+        elif isinstance(sentence, Implication):
+            antecedent = self.encode(sentence.antecedent)
+            consequent = self.encode(sentence.consequent)
+            literal = -self.define_and([antecedent, -consequent])
+        elif isinstance(sentence, Biconditional):
+            left = self.encode(sentence.left)
+            right = self.encode(sentence.right)
+            literal = self.solver.new_variable()
+            self.add_clause([-literal, -left, right])
+            self.add_clause([-literal, left, -right])
+            self.add_clause([literal, left, right])
+            self.add_clause([literal, -left, -right])
+        else:
+            raise TypeError(f"cannot encode {sentence}")
+
+        self.definitions[sentence] = literal
+        return literal
+
+    def define_and(self, literals):
+        """Returns a new variable that is true iff all `literals` are."""
+        if len(literals) == 1:
+            return literals[0]
+        literal = self.solver.new_variable()
+        for other in literals:
+            self.add_clause([-literal, other])
+        self.add_clause([literal] + [-other for other in literals])
+        return literal
+
+
+def count_clauses(clauses, variables, cache=None):
+    """
+    Counts the assignments to `variables` that satisfy every clause
+    (#SAT), splitting the clauses into independent components and caching
+    the count of each component.
+    """
+    if cache is None:
+        cache = dict()
+    clauses = [tuple(sorted(set(clause))) for clause in clauses]
+    clauses = [clause for clause in clauses
+               if not any(-literal in clause for literal in clause)]
+    return count_components(clauses, frozenset(variables), cache)
+
+
+def count_components(clauses, variables, cache):
+    """Counts models of simplified clauses over `variables`."""
+
+    # Assign every literal forced by a unit clause
+    while True:
+        unit = next((clause[0] for clause in clauses if len(clause) == 1),
+                    None)
+        if unit is None:
+            break
+        clauses = condition(clauses, unit)
+        if clauses is None:
+            return 0
+        variables = variables - {abs(unit)}
+
+    # Variables no clause mentions can take either value
+    mentioned = {abs(literal) for clause in clauses for literal in clause}
+    total = 2 ** len(variables - mentioned)
+
+    for component in components(clauses):
+        key = frozenset(component)
+        if key not in cache:
+            component_variables = frozenset(
+                abs(literal) for clause in component for literal in clause
+            )
+
+            # Branch on the variable occurring in the most clauses
+            occurrences = dict()
+            for clause in component:
+                for literal in clause:
+                    occurrences[abs(literal)] = (
+                        occurrences.get(abs(literal), 0) + 1
+                    )
+            variable = max(occurrences, key=occurrences.get)
+
+            count = 0
+            for literal in (variable, -variable):
+                branch = condition(component, literal)
+                if branch is not None:
+                    count += count_components(
+                        branch, component_variables - {variable}, cache
+                    )
+            cache[key] = count
+
+        total *= cache[key]
+        if total == 0:
+            return 0
+
+    return total
+
+
+def condition(clauses, literal):
+    """
+    Returns the clauses simplified by making `literal` true,
+    or None if some clause becomes empty.
+    """
+    result = []
+    for clause in clauses:
+        if literal in clause:
+            continue
+        if -literal in clause:
+            clause = tuple(other for other in clause if other != -literal)
+            if not clause:
+                return None
+        result.append(clause)
+    return result
+
+
+def components(clauses):
+    """Splits clauses into groups that share no variables."""
+
+    # Index clauses by the variables they mention
+    occurrences = dict()
+    for index, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(abs(literal), []).append(index)
+
+    groups = []
+    visited = set()
+    for start in range(len(clauses)):
+        if start in visited:
+            continue
+
+        # Collect every clause reachable through shared variables
+        visited.add(start)
+        frontier = [start]
+        group = []
+        while frontier:
+            index = frontier.pop()
+            group.append(clauses[index])
+            for literal in clauses[index]:
+                for other in occurrences[abs(literal)]:
+                    if other not in visited:
+                        visited.add(other)
+                        frontier.append(other)
+        groups.append(group)
+
+    return groups
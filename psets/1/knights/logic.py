@@ -1,4 +1,5 @@
 import itertools
+import re
 
 
 class Sentence():
@@ -42,6 +43,30 @@ class Sentence():
             return f"({s})"
 
 
+class Constant(Sentence):
+
+    def __init__(self, value):
+        self.value = bool(value)
+
+    def __eq__(self, other):
+        return isinstance(other, Constant) and self.value == other.value
+
+    def __hash__(self):
+        return hash(("constant", self.value))
+
+    def __repr__(self):
+        return f"Constant({self.value})"
+
+    def evaluate(self, model):
+        return self.value
+
+    def formula(self):
+        return "⊤" if self.value else "⊥"
+
+    def symbols(self):
+        return set()
+
+
 class Symbol(Sentence):
 
     def __init__(self, name):
@@ -217,8 +242,8 @@ class Biconditional(Sentence):
                     and not self.right.evaluate(model)))
 
     def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
         return f"{left} <=> {right}"
 
     def symbols(self):
@@ -261,3 +286,100 @@ def model_check(knowledge, query):
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def parse(text, symbols=None):
+    """
+    Parses a sentence written in the notation printed by `formula`
+    (¬, ∧, ∨, =>, <=>, ⊤, ⊥ and parentheses) and returns it.
+    Symbols are looked up in (and added to) the `symbols` dictionary,
+    so that sentences parsed with the same dictionary share them.
+    """
+    if symbols is None:
+        symbols = dict()
+    return Parser(text, symbols).parse()
+
+
+class Parser():
+    """
+    Recursive descent parser for sentence formulas. Operators bind from
+    loosest to tightest as <=>, =>, ∨, ∧, ¬; implication groups to the
+    right. Anything between operators and parentheses is a symbol name.
+    """
+
+    TOKENS = re.compile(r"(¬|∧|∨|<=>|=>|⊤|⊥|\(|\))")
+
+    def __init__(self, text, symbols):
+        self.tokens = [
+            token.strip() for token in Parser.TOKENS.split(text)
+            if token.strip()
+        ]
+        self.position = 0
+        self.symbols = symbols
+
+    def parse(self):
+        sentence = self.biconditional()
+        if self.position != len(self.tokens):
+            raise ValueError(f"unexpected {self.tokens[self.position]!r}")
+        return sentence
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            raise ValueError("unexpected end of formula")
+        self.position += 1
+        return token
+
+    def biconditional(self):
+        sentence = self.implication()
+        while self.peek() == "<=>":
+            self.position += 1
+            sentence = Biconditional(sentence, self.implication())
+        return sentence
+
+    def implication(self):
+        sentence = self.disjunction()
+        if self.peek() == "=>":
+            self.position += 1
+            return Implication(sentence, self.implication())
+        return sentence
+
+    def disjunction(self):
+        disjuncts = [self.conjunction()]
+        while self.peek() == "∨":
+            self.position += 1
+            disjuncts.append(self.conjunction())
+        if len(disjuncts) == 1:
+            return disjuncts[0]
+        return Or(*disjuncts)
+
+    def conjunction(self):
+        conjuncts = [self.negation()]
+        while self.peek() == "∧":
+            self.position += 1
+            conjuncts.append(self.negation())
+        if len(conjuncts) == 1:
+            return conjuncts[0]
+        return And(*conjuncts)
+
+    def negation(self):
+        token = self.take()
+        if token == "¬":
+            return Not(self.negation())
+        if token == "(":
+            sentence = self.biconditional()
+            if self.take() != ")":
+                raise ValueError("missing closing parenthesis")
+            return sentence
+        if token in ("⊤", "⊥"):
+            return Constant(token == "⊤")
+        if token in ("∧", "∨", "=>", "<=>", ")"):
+            raise ValueError(f"unexpected {token!r}")
+        if token not in self.symbols:
+            self.symbols[token] = Symbol(token)
+        return self.symbols[token]
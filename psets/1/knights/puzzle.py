@@ -1,4 +1,5 @@
 from logic import *
+from knowledge import KnowledgeBase
 
 AKnight = Symbol("A is a Knight")
 AKnave = Symbol("A is a Knave")
@@ -108,8 +109,9 @@ def main():
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
+            entailed = KnowledgeBase(knowledge).entailed_literals(symbols)
             for symbol in symbols:
-                if model_check(knowledge, symbol):
+                if symbol in entailed:
                     print(f"    {symbol}")
 
 
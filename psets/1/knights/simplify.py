@@ -0,0 +1,239 @@
+from logic import *
+
+TRUE = Constant(True)
+FALSE = Constant(False)
+
+
+class Simplification():
+    """
+    Result of simplifying a knowledge base.
+
+    `sentence` is what is left of the knowledge once the symbols in
+    `units` (entailed by the knowledge) and `pures` (occurring with a
+    single polarity) have been fixed. The knowledge entails a query whose
+    symbols were protected exactly when `sentence` entails `query(query)`.
+    """
+
+    def __init__(self, sentence, units, pures, removed_symbols,
+                 removed_clauses):
+        self.sentence = sentence
+        self.units = units
+        self.pures = pures
+        self.removed_symbols = removed_symbols
+        self.removed_clauses = removed_clauses
+
+    def __repr__(self):
+        return (f"Simplification({self.sentence}, "
+                f"removed {self.removed_symbols} symbols and "
+                f"{self.removed_clauses} clauses)")
+
+    def query(self, query):
+        """Returns `query` with the symbols fixed by units substituted."""
+        return substitute(query, self.units)
+
+
+def simplify(knowledge, protected=()):
+    """
+    Simplifies a knowledge base before any search: folds constants,
+    removes duplicated and absorbed subsentences, propagates unit facts
+    and fixes pure literals, repeating until nothing changes.
+
+    Fixing a pure literal keeps the knowledge satisfiable but is not an
+    entailment, so symbols of any query to ask later must be `protected`.
+    """
+    Sentence.validate(knowledge)
+    protected = {
+        symbol.name if isinstance(symbol, Symbol) else symbol
+        for symbol in protected
+    }
+    original_symbols = knowledge.symbols()
+    original_clauses = len(conjuncts(knowledge))
+
+    units = dict()
+    pures = dict()
+    sentence = substitute(knowledge, units)
+
+    while True:
+
+        # Top level literals fix their symbols outright
+        changed = False
+        for conjunct in conjuncts(sentence):
+            literal = as_literal(conjunct)
+            if literal is not None and literal[0] not in units:
+                units[literal[0]] = literal[1]
+                changed = True
+        if changed:
+            sentence = substitute(sentence, units)
+            continue
+
+        # Symbols used with one polarity only can take that value
+        for name, polarity in polarities(sentence).items():
+            if polarity is not None and name not in protected:
+                pures[name] = polarity
+                changed = True
+        if changed:
+            sentence = substitute(sentence, pures)
+            continue
+
+        break
+
+    return Simplification(
+        sentence,
+        units,
+        pures,
+        len(original_symbols) - len(sentence.symbols()),
+        original_clauses - len(conjuncts(sentence))
+    )
+
+
+def conjuncts(sentence):
+    """Returns the top level conjuncts of a sentence."""
+    if sentence == TRUE:
+        return []
+    if isinstance(sentence, And):
+        return sentence.conjuncts
+    return [sentence]
+
+
+def as_literal(sentence):
+    """Returns (name, value) if a sentence is a literal, or None."""
+    if isinstance(sentence, Symbol):
+        return sentence.name, True
+    if isinstance(sentence, Not) and isinstance(sentence.operand, Symbol):
+        return sentence.operand.name, False
+    return None
+
+
+def polarities(sentence):
+    """
+    Returns a dictionary from each symbol name to True or False if it only
+    occurs positively or negatively in a sentence, or None if both.
+    """
+    found = dict()
+
+    def visit(sentence, positive):
+        if isinstance(sentence, Symbol):
+            if found.get(sentence.name, positive) != positive:
+                found[sentence.name] = None
+            else:
+                found[sentence.name] = positive
+        elif isinstance(sentence, Not):
+            visit(sentence.operand, not positive)
+        elif isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                visit(conjunct, positive)
+        elif isinstance(sentence, Or):
+            for disjunct in sentence.disjuncts:
+                visit(disjunct, positive)
+        elif isinstance(sentence, Implication):
+            visit(sentence.antecedent, not positive)
+            visit(sentence.consequent, positive)
+        elif isinstance(sentence, Biconditional):
+            for name in sentence.symbols():
+                found[name] = None
+
+    visit(sentence, True)
+    return found
+
+
+def substitute(sentence, assignment):
+    """
+    Returns a sentence equivalent to `sentence` once the symbols in
+    `assignment` take their values, with constants folded away.
+    """
+    if isinstance(sentence, Constant):
+        return sentence
+
+    if isinstance(sentence, Symbol):
+        if sentence.name in assignment:
+            return Constant(assignment[sentence.name])
+        return sentence
+
+    if isinstance(sentence, Not):
+        operand = substitute(sentence.operand, assignment)
+        if isinstance(operand, Constant):
+            return Constant(not operand.value)
+        if isinstance(operand, Not):
+            return operand.operand
+        return Not(operand)
+
+    if isinstance(sentence, And):
+        return join(And, [substitute(c, assignment)
+                          for c in sentence.conjuncts])
+
+    if isinstance(sentence, Or):
+        return join(Or, [substitute(d, assignment)
+                         for d in sentence.disjuncts])
+
+    if isinstance(sentence, Implication):
+        antecedent = substitute(sentence.antecedent, assignment)
+        consequent = substitute(sentence.consequent, assignment)
+        return join(Or, [substitute(Not(antecedent), {}), consequent])
+
+    if isinstance(sentence, Biconditional):
+        left = substitute(sentence.left, assignment)
+        right = substitute(sentence.right, assignment)
+
+        # A constant side leaves either the other side or its negation
+        if isinstance(left, Constant):
+            left, right = right, left
+        if isinstance(right, Constant):
+            return left if right.value else substitute(Not(left), {})
+
+        if left == right:
+            return TRUE
+        if left == Not(right) or Not(left) == right:
+            return FALSE
+
+        # Order sides consistently so duplicates compare equal
+        if repr(right) < repr(left):
+            left, right = right, left
+        return Biconditional(left, right)
+
+    raise TypeError(f"cannot simplify {sentence}")
+
+
+def join(connective, operands):
+    """
+    Builds a conjunction or disjunction of simplified operands, flattening
+    nested ones and applying idempotence, complement and absorption.
+    """
+    identity = TRUE if connective is And else FALSE
+    absorbing = FALSE if connective is And else TRUE
+    dual = Or if connective is And else And
+
+    # Flatten nested connectives of the same kind and drop duplicates
+    flattened = []
+    seen = set()
+    for operand in operands:
+        parts = (operand.conjuncts if connective is And
+                 else operand.disjuncts) if isinstance(
+                     operand, connective) else [operand]
+        for part in parts:
+            if part == absorbing:
+                return absorbing
+            if part == identity or part in seen:
+                continue
+            seen.add(part)
+            flattened.append(part)
+
+    # An operand together with its negation decides the result
+    for operand in flattened:
+        if Not(operand) in seen:
+            return absorbing
+
+    # A ∧ (A ∨ B) is just A, and A ∨ (A ∧ B) is just A
+    kept = []
+    for operand in flattened:
+        if isinstance(operand, dual):
+            parts = (operand.conjuncts if dual is And
+                     else operand.disjuncts)
+            if any(part in seen for part in parts):
+                continue
+        kept.append(operand)
+
+    if not kept:
+        return identity
+    if len(kept) == 1:
+        return kept[0]
+    return connective(*kept)
@@ -0,0 +1,311 @@
+class Solver():
+    """
+    Conflict-driven clause learning (CDCL) satisfiability solver.
+
+    Variables are positive integers and literals are non-zero integers:
+    `v` means variable v is true and `-v` means it is false. Clauses are
+    lists of literals. Clauses learned while solving are kept, so every
+    call to `solve` benefits from the work done by the previous ones.
+    """
+
+    def __init__(self):
+
+        # Clause database (original and learned) and watch lists per literal
+        self.clauses = []
+        self.watches = [[], []]
+
+        # Per variable state, index 0 is unused
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+        self.activity = [0.0]
+        self.phases = [False]
+
+        # Assignment trail and the index where each decision level begins
+        self.trail = []
+        self.trail_limits = []
+        self.propagated = 0
+
+        # Activity increment used to favour variables in recent conflicts
+        self.increment = 1.0
+
+        # Set once the clauses are unsatisfiable without any assumptions
+        self.inconsistent = False
+
+        # Last satisfying assignment found, indexed by variable
+        self.model = None
+
+    def new_variable(self):
+        """Creates a new variable and returns it."""
+        self.values.append(None)
+        self.levels.append(0)
+        self.reasons.append(None)
+        self.activity.append(0.0)
+        self.phases.append(False)
+        self.watches.append([])
+        self.watches.append([])
+        return len(self.values) - 1
+
+    @property
+    def num_variables(self):
+        return len(self.values) - 1
+
+    def add_clause(self, literals):
+        """
+        Adds a clause to the solver.
+        Returns False if the clauses have become unsatisfiable.
+        """
+        if self.inconsistent:
+            return False
+        self.backtrack(0)
+
+        clause = []
+        for literal in literals:
+            value = self.literal_value(literal)
+
+            # Clause already satisfied at the top level, nothing to add
+            if value is True or -literal in clause:
+                return True
+
+            # Literals false at the top level can never help satisfy it
+            if value is None and literal not in clause:
+                clause.append(literal)
+
+        if not clause:
+            self.inconsistent = True
+            return False
+
+        if len(clause) == 1:
+            self.assign(clause[0], None)
+            if self.propagate() is not None:
+                self.inconsistent = True
+                return False
+            return True
+
+        self.attach(clause)
+        return True
+
+    def solve(self, assumptions=()):
+        """
+        Searches for an assignment satisfying every clause in which all
+        `assumptions` literals are true.
+        Returns True and stores the assignment in `self.model` if found.
+        """
+        if self.inconsistent:
+            return False
+        self.backtrack(0)
+        assumptions = list(assumptions)
+
+        conflicts = 0
+        restart_limit = 100
+
+        while True:
+            conflict = self.propagate()
+
+            if conflict is not None:
+                conflicts += 1
+
+                # A conflict without any decision can never be resolved
+                if not self.trail_limits:
+                    self.inconsistent = True
+                    return False
+
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.assign(learned[0], None)
+                else:
+                    self.assign(learned[0], self.attach(learned))
+                self.decay()
+                continue
+
+            # Restart now and then, keeping everything learned so far
+            if conflicts >= restart_limit:
+                conflicts = 0
+                restart_limit = int(restart_limit * 1.5)
+                self.backtrack(0)
+                continue
+
+            # Assumptions are always the first decisions made
+            level = len(self.trail_limits)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                value = self.literal_value(literal)
+                if value is False:
+                    self.backtrack(0)
+                    return False
+                self.trail_limits.append(len(self.trail))
+                if value is None:
+                    self.assign(literal, None)
+                continue
+
+            variable = self.pick_variable()
+
+            # Every variable has a value, so the clauses are satisfied
+            if variable is None:
+                self.model = list(self.values)
+                self.backtrack(0)
+                return True
+
+            self.trail_limits.append(len(self.trail))
+            self.assign(variable if self.phases[variable] else -variable, None)
+
+    def literal_value(self, literal):
+        """Returns the value of a literal, or None if it is unassigned."""
+        value = self.values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def watch_index(self, literal):
+        return 2 * literal if literal > 0 else -2 * literal + 1
+
+    def attach(self, clause):
+        """Stores a clause and watches its first two literals."""
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[self.watch_index(clause[0])].append(index)
+        self.watches[self.watch_index(clause[1])].append(index)
+        return index
+
+    def assign(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def backtrack(self, level):
+        """Undoes every assignment made above decision level `level`."""
+        if len(self.trail_limits) <= level:
+            return
+        start = self.trail_limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            self.values[variable] = None
+            self.reasons[variable] = None
+        del self.trail[start:]
+        del self.trail_limits[level:]
+        self.propagated = min(self.propagated, start)
+
+    def propagate(self):
+        """
+        Performs unit propagation over the watched literals.
+        Returns the index of a conflicting clause, or None.
+        """
+        while self.propagated < len(self.trail):
+            false_literal = -self.trail[self.propagated]
+            self.propagated += 1
+
+            index = self.watch_index(false_literal)
+            watching = self.watches[index]
+            kept = []
+
+            for position, clause_index in enumerate(watching):
+                clause = self.clauses[clause_index]
+
+                # Keep the false literal in the second watched slot
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                # Clause already satisfied by its other watched literal
+                if self.literal_value(clause[0]) is True:
+                    kept.append(clause_index)
+                    continue
+
+                # Look for another literal that is not false to watch
+                for other in range(2, len(clause)):
+                    if self.literal_value(clause[other]) is not False:
+                        clause[1], clause[other] = clause[other], clause[1]
+                        self.watches[self.watch_index(clause[1])].append(
+                            clause_index
+                        )
+                        break
+                else:
+                    kept.append(clause_index)
+
+                    # Every literal is false, so the clause is in conflict
+                    if self.literal_value(clause[0]) is False:
+                        kept.extend(watching[position + 1:])
+                        self.watches[index] = kept
+                        self.propagated = len(self.trail)
+                        return clause_index
+
+                    # Only one literal left, so it must be true
+                    self.assign(clause[0], clause_index)
+
+            self.watches[index] = kept
+
+        return None
+
+    def analyze(self, conflict):
+        """
+        Derives a learned clause from a conflict (first unique implication
+        point) and returns it together with the level to backtrack to.
+        """
+        current = len(self.trail_limits)
+        learned = [None]
+        seen = set()
+        pending = 0
+        literal = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == current:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Walk back to the latest assignment involved in the conflict
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+
+        learned[0] = -literal
+
+        # Watch the literal assigned last among the rest of the clause
+        level = 0
+        if len(learned) > 1:
+            deepest = max(
+                range(1, len(learned)),
+                key=lambda i: self.levels[abs(learned[i])]
+            )
+            learned[1], learned[deepest] = learned[deepest], learned[1]
+            level = self.levels[abs(learned[1])]
+
+        return learned, level
+
+    def bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.increment *= 1e-100
+
+    def decay(self):
+        self.increment /= 0.95
+
+    def pick_variable(self):
+        """Returns the unassigned variable with the highest activity."""
+        best = None
+        best_activity = -1.0
+        for variable in range(1, len(self.values)):
+            if (self.values[variable] is None
+                    and self.activity[variable] > best_activity):
+                best = variable
+                best_activity = self.activity[variable]
+        return best
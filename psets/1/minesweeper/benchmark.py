@@ -0,0 +1,72 @@
+import math
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+# Board sizes as (height, width, mines)
+BOARDS = [
+    (8, 8, 8),
+    (16, 16, 40),
+    (16, 30, 99),
+    (50, 50, 400),
+    (100, 100, 1600),
+]
+
+GAMES = 10
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [games]")
+    games = int(sys.argv[1]) if len(sys.argv) == 2 else GAMES
+
+    print(f"{'board':>14}{'moves':>8}{'mean ms':>10}"
+          f"{'p99 ms':>10}{'max ms':>10}{'sentences':>11}")
+
+    for height, width, mines in BOARDS:
+        times = []
+        sentences = 0
+        for seed in range(games):
+            random.seed(seed)
+            game = Minesweeper(height=height, width=width, mines=mines)
+            ai = MinesweeperAI(height=height, width=width, mines=mines)
+            times.extend(play(game, ai))
+            sentences = max(sentences, len(ai.knowledge))
+
+        if not times:
+            print(f"{f'{height}x{width}/{mines}':>14}{0:>8}")
+            continue
+
+        # Time per move, in milliseconds, with p99 by nearest rank so that
+        # a few moves report the slowest rather than the fastest
+        times.sort()
+        mean = 1000 * sum(times) / len(times)
+        p99 = 1000 * times[math.ceil(0.99 * len(times)) - 1]
+        print(f"{f'{height}x{width}/{mines}':>14}{len(times):>8}"
+              f"{mean:>10.3f}{p99:>10.3f}{1000 * times[-1]:>10.3f}"
+              f"{sentences:>11}")
+
+
+def play(game, ai):
+    """
+    Plays a game until a mine is hit or no move is left, and returns the
+    time taken by each move (choosing it and adding its knowledge).
+    """
+    times = []
+    while True:
+        start = time.perf_counter()
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+        if move is None or game.is_mine(move):
+            return times
+        ai.add_knowledge_batch(game.reveal(move))
+        times.append(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import copy
+import random
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+# Boards as (height, width, mines), and seeded games played on each
+BOARDS = [(8, 8, 8), (8, 8, 12), (16, 16, 40)]
+GAMES = 20
+
+
+class FixpointSentence():
+    """
+    Sentence of the original MinesweeperAI, kept to check the
+    incremental inference against.
+    """
+
+    def __init__(self, cells, count):
+        self.cells = set(cells)
+        self.count = count
+
+    def __eq__(self, other):
+        return self.cells == other.cells and self.count == other.count
+
+    def mark_mine(self, cell):
+        if cell in self.cells:
+            self.cells.remove(cell)
+            self.count -= 1
+
+    def mark_safe(self, cell):
+        if cell in self.cells:
+            self.cells.remove(cell)
+
+
+class FixpointAI():
+    """
+    Original MinesweeperAI inference: after every move, rescan all
+    knowledge and compare every pair of sentences until nothing changes.
+    """
+
+    def __init__(self, height=8, width=8):
+        self.height = height
+        self.width = width
+        self.mines = set()
+        self.safes = set()
+        self.knowledge = []
+
+    def mark_mine(self, cell):
+        self.mines.add(cell)
+        for sentence in self.knowledge:
+            sentence.mark_mine(cell)
+
+    def mark_safe(self, cell):
+        self.safes.add(cell)
+        for sentence in self.knowledge:
+            sentence.mark_safe(cell)
+
+    def add_knowledge(self, cell, count):
+        self.mark_safe(cell)
+
+        unknown = set()
+        for neighbour in self.cell_neighbours(cell):
+            if neighbour in self.mines:
+                count -= 1
+            elif neighbour not in self.safes:
+                unknown.add(neighbour)
+        self.knowledge.append(FixpointSentence(unknown, count))
+
+        change = True
+        while change:
+            change = False
+
+            # Mark the cells of sentences with no mines, or only mines
+            for sentence in copy.deepcopy(self.knowledge):
+                if sentence.count == 0:
+                    change = True
+                    for cell in sentence.cells:
+                        self.mark_safe(cell)
+                if sentence.count == len(sentence.cells):
+                    change = True
+                    for cell in sentence.cells:
+                        self.mark_mine(cell)
+
+            # Drop empty sentences and duplicates
+            knowledge = []
+            for sentence in self.knowledge:
+                if sentence.cells and sentence not in knowledge:
+                    knowledge.append(sentence)
+            self.knowledge = knowledge
+
+            # Subset reasoning, both ways
+            new_sentences = []
+            for i, first in enumerate(self.knowledge):
+                for j, second in enumerate(self.knowledge):
+                    if i == j or not first.cells <= second.cells:
+                        continue
+                    new_sentence = FixpointSentence(
+                        second.cells - first.cells, second.count - first.count
+                    )
+                    if (new_sentence.cells and new_sentence.count >= 0
+                            and new_sentence not in self.knowledge
+                            and new_sentence not in new_sentences):
+                        change = True
+                        new_sentences.append(new_sentence)
+            self.knowledge.extend(new_sentences)
+
+    def cell_neighbours(self, cell):
+        return {
+            (i, j)
+            for i in range(cell[0] - 1, cell[0] + 2)
+            for j in range(cell[1] - 1, cell[1] + 2)
+            if (i, j) != cell and 0 <= i < self.height and 0 <= j < self.width
+        }
+
+
+# Replay seeded games, opening cells one at a time on both players, and
+# compare the safes and mines they know after every cell
+failures = 0
+for height, width, mines in BOARDS:
+    for seed in range(GAMES):
+        random.seed(seed)
+        game = Minesweeper(height=height, width=width, mines=mines)
+        ai = MinesweeperAI(height=height, width=width, mines=mines)
+        reference = FixpointAI(height=height, width=width)
+
+        # Open safe cells only, so every game runs to the end
+        hidden = [(i, j) for i in range(height) for j in range(width)
+                  if not game.is_mine((i, j))]
+        random.shuffle(hidden)
+        while True:
+            move = ai.make_safe_move()
+            if move is None:
+                move = next((cell for cell in hidden
+                             if cell not in ai.moves_made), None)
+            if move is None:
+                break
+
+            count = game.nearby_mines(move)
+            ai.add_knowledge(move, count)
+            reference.add_knowledge(move, count)
+            if ai.safes != reference.safes or ai.mines != reference.mines:
+                failures += 1
+                print(f"{height}x{width}/{mines} game {seed}: after {move}, "
+                      f"safes differ by {ai.safes ^ reference.safes}, "
+                      f"mines differ by {ai.mines ^ reference.mines}")
+                break
+
+print(f"{failures} games differ from the fixpoint inference")
@@ -1,5 +1,9 @@
+import collections
 import itertools
-import random, copy
+import math
+import random
+
+import numpy as np
 
 
 class Minesweeper():
@@ -12,26 +16,27 @@ class Minesweeper():
         # Set initial width, height, and number of mines
         self.height = height
         self.width = width
-        self.mines = set()
 
-        # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
-
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
-
-        # At first, player has found no mines
+        # Place all mines at once on distinct cells, drawing from the
+        # random module so that seeding it still fixes the board
+        rng = np.random.default_rng(random.getrandbits(64))
+        positions = rng.choice(height * width, size=mines, replace=False)
+        self.board = np.zeros((height, width), dtype=bool)
+        self.board.flat[positions] = True
+        self.mines = {divmod(int(position), width) for position in positions}
+
+        # Count the mines around every cell with a 3x3 convolution,
+        # summing the shifted board for each neighbouring offset
+        padded = np.pad(self.board, 1).astype(np.int8)
+        self.counts = np.zeros((height, width), dtype=np.int8)
+        for i in range(3):
+            for j in range(3):
+                if (i, j) != (1, 1):
+                    self.counts += padded[i:i + height, j:j + width]
+
+        # At first, player has found no mines and revealed no cells
         self.mines_found = set()
+        self.revealed = set()
 
     def print(self):
         """
@@ -50,7 +55,7 @@ class Minesweeper():
 
     def is_mine(self, cell):
         i, j = cell
-        return self.board[i][j]
+        return bool(self.board[i, j])
 
     def nearby_mines(self, cell):
         """
@@ -58,24 +63,32 @@ class Minesweeper():
         within one row and column of a given cell,
         not including the cell itself.
         """
+        i, j = cell
+        return int(self.counts[i, j])
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
+    def reveal(self, cell):
+        """
+        Reveals a cell that is not a mine, and every cell reachable from it
+        through cells with no nearby mines (breadth-first flood fill).
+        Returns a dictionary from each newly revealed cell to its count.
+        """
+        opened = dict()
+        queue = collections.deque([cell])
+        while queue:
+            i, j = queue.popleft()
+            if (i, j) in self.revealed:
+                continue
+            self.revealed.add((i, j))
+            opened[(i, j)] = int(self.counts[i, j])
 
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
+            # Cells around a zero are all safe, so open them too
+            if self.counts[i, j] == 0:
+                for a in range(max(i - 1, 0), min(i + 2, self.height)):
+                    for b in range(max(j - 1, 0), min(j + 2, self.width)):
+                        if (a, b) not in self.revealed:
+                            queue.append((a, b))
 
-        return count
+        return opened
 
     def won(self):
         """
@@ -84,28 +97,172 @@ class Minesweeper():
         return self.mines_found == self.mines
 
 
+def mask_bits(mask):
+    """Yields the position of every bit set in a mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def count_solutions(sentences):
+    """
+    Counts the ways of placing mines on the cells of a group of sentences,
+    assigning cells one at a time and merging partial assignments that
+    leave the same number of mines in every sentence still open.
+    Returns the cells, the number of solutions with each number of mines,
+    and for each number of mines how many solutions have each cell mined.
+    """
+    sentences = list(sentences)
+
+    # Order sentences breadth first through shared cells, so that few of
+    # them are open at once, and cells by the first sentence naming them
+    order = []
+    left = sorted(sentences, key=lambda s: s.mask & -s.mask)
+    reached = 0
+    while left:
+        touching = [s for s in left if s.mask & reached] or left[:1]
+        for sentence in touching:
+            left.remove(sentence)
+            order.append(sentence)
+            reached |= sentence.mask
+    sentences = order
+
+    bits = []
+    covered = 0
+    for sentence in sentences:
+        bits.extend(mask_bits(sentence.mask & ~covered))
+        covered |= sentence.mask
+    position = {bit: index for index, bit in enumerate(bits)}
+
+    # Sentences naming each cell, and how many of their cells come after it
+    containing = [[] for _ in bits]
+    first = dict()
+    last = dict()
+    for index, sentence in enumerate(sentences):
+        positions = sorted(position[bit] for bit in mask_bits(sentence.mask))
+        first[index], last[index] = positions[0], positions[-1]
+        for remaining, p in enumerate(reversed(positions)):
+            containing[p].append((index, remaining))
+
+    # Sentences opened before each cell and not yet closed
+    open_before = [
+        [index for index in first if first[index] < p <= last[index]]
+        for p in range(len(bits) + 1)
+    ]
+
+    def step(p, state, value):
+        """Returns the state after giving cell `p` a value, or None."""
+        placed = dict(zip(open_before[p], state))
+        for index, remaining in containing[p]:
+            count = placed.get(index, 0) + value
+            need = sentences[index].count
+            if count > need or count + remaining < need:
+                return None
+            placed[index] = count
+        return tuple(placed[index] for index in open_before[p + 1])
+
+    # Forward pass, counting solutions of the cells before each position
+    forward = [{(): {0: 1}}]
+    moves = []
+    for p in range(len(bits)):
+        after = dict()
+        moves.append([])
+        for state, counts in forward[p].items():
+            for value in (0, 1):
+                following = step(p, state, value)
+                if following is None:
+                    continue
+                moves[p].append((state, value, following))
+                merged = after.setdefault(following, dict())
+                for k, n in counts.items():
+                    merged[k + value] = merged.get(k + value, 0) + n
+        forward.append(after)
+
+    # Backward pass, counting completions of the cells from each position
+    backward = [dict() for _ in bits] + [{(): {0: 1}}]
+    for p in reversed(range(len(bits))):
+        for state, value, following in moves[p]:
+            if following not in backward[p + 1]:
+                continue
+            merged = backward[p].setdefault(state, dict())
+            for k, n in backward[p + 1][following].items():
+                merged[k + value] = merged.get(k + value, 0) + n
+
+    totals = backward[0].get((), dict()) if bits else {0: 1}
+    mines = {k: [0] * len(bits) for k in totals}
+    for p in range(len(bits)):
+        for state, value, following in moves[p]:
+            if value and following in backward[p + 1]:
+                for k, n in convolve(forward[p][state],
+                                     backward[p + 1][following]).items():
+                    mines[k + 1][p] += n
+    return [divmod(bit, sentences[0].width) for bit in bits], totals, mines
+
+
+def convolve(first, second):
+    """Combines two counts of solutions by number of mines."""
+    result = dict()
+    for i, m in first.items():
+        for j, n in second.items():
+            result[i + j] = result.get(i + j, 0) + m * n
+    return result
+
+
 class Sentence():
     """
     Logical statement about a Minesweeper game
     A sentence consists of a set of board cells,
     and a count of the number of those cells which are mines.
+
+    Cells are stored as the bits of an integer mask, cell (i, j) as bit
+    i * width + j of a board `width` cells wide, so comparing and combining
+    sentences is done with integer operations.
     """
 
-    def __init__(self, cells, count):
-        self.cells = set(cells)
+    def __init__(self, cells, count, width=8):
+        self.width = width
+        self.mask = 0
+        for cell in cells:
+            self.mask |= 1 << self.cell_bit(cell)
         self.count = count
 
+    @classmethod
+    def from_mask(cls, mask, count, width=8):
+        sentence = cls((), count, width)
+        sentence.mask = mask
+        return sentence
+
+    @property
+    def cells(self):
+        return {divmod(bit, self.width) for bit in mask_bits(self.mask)}
+
+    def cell_bit(self, cell):
+        """Returns the bit standing for a cell in the mask."""
+        i, j = cell
+        return i * self.width + j
+
+    def __len__(self):
+        return self.mask.bit_count()
+
     def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
+        return self.mask == other.mask and self.count == other.count
+
+    def __hash__(self):
+        return hash((self.mask, self.count))
 
     def __str__(self):
         return f"{self.cells} = {self.count}"
 
+    def issubset(self, other):
+        """Checks if every cell of this sentence is in `other`."""
+        return self.mask & ~other.mask == 0
+
     def known_mines(self):
         """
         Returns the set of all cells in self.cells known to be mines.
         """
-        if self.count == len(self.cells): return self.cells
+        if self.count == len(self): return self.cells
         return set()
 
     def known_safes(self):
@@ -120,8 +277,9 @@ class Sentence():
         Updates internal knowledge representation given the fact that
         a cell is known to be a mine.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        bit = 1 << self.cell_bit(cell)
+        if self.mask & bit:
+            self.mask ^= bit
             self.count -= 1
 
     def mark_safe(self, cell):
@@ -129,8 +287,48 @@ class Sentence():
         Updates internal knowledge representation given the fact that
         a cell is known to be safe.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        self.mask &= ~(1 << self.cell_bit(cell))
+
+
+class CellPool():
+    """
+    Set of cells that can also return a uniformly random member in
+    constant time, by keeping the cells in a list too.
+    """
+
+    def __init__(self, cells=()):
+        self.cells = []
+        self.positions = dict()
+        for cell in cells:
+            self.add(cell)
+
+    def __contains__(self, cell):
+        return cell in self.positions
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def add(self, cell):
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        position = self.positions.pop(cell, None)
+        if position is None:
+            return
+
+        # Move the last cell into the freed position
+        last = self.cells.pop()
+        if position < len(self.cells):
+            self.cells[position] = last
+            self.positions[last] = position
+
+    def choice(self):
+        return random.choice(self.cells)
 
 
 class MinesweeperAI():
@@ -138,12 +336,15 @@ class MinesweeperAI():
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Total number of mines on the board, if known
+        self.total_mines = mines
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -151,26 +352,69 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge: list[Sentence] = []
+        # Cells known to be safe but not played yet, and cells neither
+        # played nor known to be safe or mines
+        self.safe_moves = CellPool()
+        self.unknown = CellPool(
+            (i, j) for i in range(height) for j in range(width)
+        )
+
+        # Sentences about the game known to be true
+        self.knowledge: set[Sentence] = set()
+
+        # Sentences containing each cell, by the cell's bit
+        self.index: dict[int, set[Sentence]] = dict()
+
+        # Sentences not yet compared against the rest of the knowledge
+        self.pending: list[Sentence] = []
+
+        # Cells waiting to be marked, and whether they are mines
+        self.marks: list[tuple[tuple, bool]] = []
+
+        # Solutions of each independent group of sentences, while unchanged
+        self.components: dict[frozenset, tuple] = dict()
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
-        self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.marks.append((cell, True))
+        self.apply_marks()
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
-        self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self.marks.append((cell, False))
+        self.apply_marks()
+
+    def apply_marks(self):
+        """
+        Applies queued marks, rewriting only the sentences that contain
+        each marked cell. Rewritten sentences that become trivial queue
+        further marks, until the cascade is over.
+        """
+        while self.marks:
+            cell, mine = self.marks.pop()
+            known = self.mines if mine else self.safes
+            if cell in known:
+                continue
+            known.add(cell)
+            self.unknown.discard(cell)
+            if not mine and cell not in self.moves_made:
+                self.safe_moves.add(cell)
+
+            # Sentences are hashed by value, so replace rather than modify
+            i, j = cell
+            bit = i * self.width + j
+            for sentence in list(self.index.get(bit, ())):
+                self.remove_sentence(sentence)
+                self.add_sentence(Sentence.from_mask(
+                    sentence.mask & ~(1 << bit), sentence.count - mine,
+                    self.width
+                ))
 
     def add_knowledge(self, cell, count):
         """
@@ -187,92 +431,113 @@ class MinesweeperAI():
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
         """
-        self.moves_made.add(cell)
-        self.mark_safe(cell)
+        self.add_knowledge_batch({cell: count})
 
-        unknow_neighbours = set()
-        new_count = copy.deepcopy(count)
-        for neighbour in self.cell_neighbours(cell):
-            
-            # Verify if the neighbour is a mine
-            if neighbour in self.mines:
-                new_count -= 1
-                continue
+    def add_knowledge_batch(self, revealed):
+        """
+        Adds knowledge for many revealed cells at once, given a dictionary
+        from each cell to its count of neighbouring mines (as returned by
+        `Minesweeper.reveal`). Inference runs once for the whole batch.
+        """
 
-            # Verify if the neighbour is a safe place
-            if neighbour in self.safes:
+        # Every revealed cell is a move made and is safe
+        for cell in revealed:
+            self.moves_made.add(cell)
+            self.safe_moves.discard(cell)
+            self.unknown.discard(cell)
+            self.marks.append((cell, False))
+        self.apply_marks()
+
+        for cell, count in revealed.items():
+            unknow_neighbours = set()
+            new_count = count
+            for neighbour in self.cell_neighbours(cell):
+
+                # Verify if the neighbour is a mine
+                if neighbour in self.mines:
+                    new_count -= 1
+                    continue
+
+                # Verify if the neighbour is a safe place
+                if neighbour in self.safes:
+                    continue
+
+                # Just add unknown cells
+                unknow_neighbours.add(neighbour)
+
+            self.add_sentence(Sentence(unknow_neighbours, new_count, self.width))
+        self.apply_marks()
+
+        # Draw every conclusion the new sentences lead to
+        self.infer()
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge base, unless it is empty or
+        already known, and queues it to be compared with related sentences.
+        Sentences with no mines, or only mines, are retired at once and
+        their cells queued to be marked instead.
+        """
+        if sentence.count == 0:
+            self.marks.extend((cell, False) for cell in sentence.cells)
+            return
+        if sentence.count == len(sentence):
+            self.marks.extend((cell, True) for cell in sentence.cells)
+            return
+        if sentence in self.knowledge:
+            return
+
+        self.knowledge.add(sentence)
+        for bit in mask_bits(sentence.mask):
+            self.index.setdefault(bit, set()).add(sentence)
+        self.pending.append(sentence)
+
+    def remove_sentence(self, sentence):
+        """Removes a sentence from the knowledge base and the cell index."""
+        self.knowledge.discard(sentence)
+        for bit in mask_bits(sentence.mask):
+            sentences = self.index[bit]
+            sentences.discard(sentence)
+            if not sentences:
+                del self.index[bit]
+
+    def infer(self):
+        """
+        Processes queued sentences until none is left, adding sentences
+        inferred by subset reasoning (and marking the cells they decide).
+        Only sentences sharing a cell with a queued one are examined.
+        """
+        while self.pending:
+            sentence = self.pending.pop()
+
+            # Sentence was rewritten or retired after being queued
+            if sentence not in self.knowledge:
                 continue
-            
-            # Just add unknown cells
-            unknow_neighbours.add(neighbour)
-            
-        self.knowledge.append(Sentence(unknow_neighbours, new_count))
-
-        # Reorganize knowledge
-        change = True
-        while change:
-            change = False
-
-            all_sentences = copy.deepcopy(self.knowledge)
-            for sentence in all_sentences:
-                
-                # Verify if there is a sentence without bombs (count zero)
-                if sentence.count == 0:
-                    change = True
-
-                    # Mark all cell as safe
-                    for cell in sentence.cells: 
-                        self.mark_safe(cell)
-
-                # Verify if there is a sentece where the number of bombs and cells are the same
-                if sentence.count == len(sentence.cells):
-                    change = True
-
-                    # Mark all cells as mines
-                    for cell in sentence.cells:
-                        self.mark_mine(cell)
-
-            # Remove empty sets (set())
-            self.knowledge = [sentence for sentence in self.knowledge if sentence.cells]   
-            
-            # Remove duplicates
-            new_knowledge = []
-            for sentence in self.knowledge:
-
-                if sentence not in new_knowledge:
-                    new_knowledge.append(sentence)
-
-            self.knowledge = new_knowledge
-                    
-            # Subset reasoning
-            all_sentences = copy.deepcopy(self.knowledge)
-            new_sentences = []
-
-            for i, sentence1 in enumerate(all_sentences):
-                for j, sentence2 in enumerate(all_sentences):
-                    if i == j: continue  # Avoid comparing the sentence with itself
-                    
-                    # Ensure subset inference works both ways
-                    if sentence1.cells.issubset(sentence2.cells):
-                        new_cells = sentence2.cells - sentence1.cells
-                        new_count = sentence2.count - sentence1.count
-                    elif sentence2.cells.issubset(sentence1.cells):
-                        new_cells = sentence1.cells - sentence2.cells
-                        new_count = sentence1.count - sentence2.count
-                    else:
-                        continue
-
-                    # Ensure the new sentence is valid
-                    if new_cells and new_count >= 0:
-                        new_sentence = Sentence(new_cells, new_count)
-
-                        # Avoid duplicates before adding
-                        if new_sentence not in self.knowledge:
-                            change = True
-                            new_sentences.append(new_sentence)
-
-            # Add inferred sentences to knowledge base
-            self.knowledge.extend(new_sentences)
+
+            # Only sentences sharing a cell can be subsets or supersets
+            related = set()
+            for bit in mask_bits(sentence.mask):
+                related.update(self.index[bit])
+            related.discard(sentence)
+
+            # Subset reasoning, both ways
+            for other in related:
+                if other.issubset(sentence):
+                    new_mask = sentence.mask & ~other.mask
+                    new_count = sentence.count - other.count
+                elif sentence.issubset(other):
+                    new_mask = other.mask & ~sentence.mask
+                    new_count = other.count - sentence.count
+                else:
+                    continue
+
+                # Ensure the new sentence is valid
+                if new_count >= 0:
+                    self.add_sentence(Sentence.from_mask(
+                        new_mask, new_count, self.width
+                    ))
+
+            self.apply_marks()
 
     def make_safe_move(self):
         """
@@ -283,17 +548,8 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        safe_moves = []
-        for i in range(self.height):
-            for j in range(self.width):
-
-                if ((i, j) not in self.mines and
-                    (i, j) not in self.moves_made and
-                    (i, j) in self.safes):
-                    safe_moves.append((i, j))
-
-        if len(safe_moves) == 0: return None
-        return safe_moves.pop()
+        if len(self.safe_moves) == 0: return None
+        return self.safe_moves.choice()
 
     def make_random_move(self):
         """
@@ -302,16 +558,136 @@ class MinesweeperAI():
             1) have not already been chosen, and
             2) are not known to be mines
         """
-        random_moves = []
-        for i in range(self.height):
-            for j in range(self.width):
+        if len(self.unknown) == 0: return self.make_safe_move()
+
+        # Pick randomly among the cells least likely to be mines
+        probabilities, elsewhere = self.mine_probabilities(len(self.unknown))
+        others = len(self.unknown) - len(probabilities)
+        lowest = min(probabilities.values(), default=elsewhere)
+        if others:
+            lowest = min(lowest, elsewhere)
+        candidates = [cell for cell, probability in probabilities.items()
+                      if probability <= lowest + 1e-12]
+
+        # Knowledge that no placement of the mines agrees with leaves no
+        # probabilities, so fall back to any cell still unknown
+        if not candidates:
+            return self.unconstrained_cell(probabilities)
+
+        # Cells no sentence mentions are drawn from the live pool of
+        # unknown cells, giving each candidate the same chance
+        if others and elsewhere <= lowest + 1e-12:
+            if random.randrange(len(candidates) + others) >= len(candidates):
+                return self.unconstrained_cell(probabilities)
+
+        return random.choice(candidates)
+
+    def unconstrained_cell(self, frontier):
+        """
+        Returns a uniformly random unknown cell that is not in `frontier`,
+        sampling the pool of unknown cells until one is found, or None if
+        there is no such cell.
+        """
+        for _ in range(32):
+            cell = self.unknown.choice()
+            if cell not in frontier:
+                return cell
+
+        # The frontier covers most unknown cells, so list the others
+        others = [cell for cell in self.unknown if cell not in frontier]
+        return random.choice(others) if others else None
 
-                if ((i, j) not in self.mines and
-                    (i, j) not in self.moves_made):
-                    random_moves.append((i, j))
+    def mine_probabilities(self, unknown):
+        """
+        Returns the probability of each cell mentioned by the knowledge
+        being a mine, and the probability for any other of the `unknown`
+        cells, which are neither played nor known to be safe or mines.
+
+        Sentences are split into groups sharing no cells, each group's
+        solutions are enumerated (or reused while the group is unchanged)
+        and the groups are combined using the total number of mines.
+        """
+        groups = []
+        seen = set()
+        for sentence in self.knowledge:
+            if sentence in seen:
+                continue
 
-        if len(random_moves) == 0: return None
-        return random_moves.pop()
+            # Collect every sentence connected to this one through cells
+            seen.add(sentence)
+            group = [sentence]
+            for member in group:
+                for bit in mask_bits(member.mask):
+                    for other in self.index[bit]:
+                        if other not in seen:
+                            seen.add(other)
+                            group.append(other)
+            groups.append(frozenset(group))
+
+        # Reuse solutions of unchanged groups and forget the rest
+        components = dict()
+        for group in groups:
+            components[group] = (self.components.get(group)
+                                 or count_solutions(group))
+        self.components = components
+
+        solutions = list(components.values())
+        frontier = sum(len(cells) for cells, _, _ in solutions)
+        others = unknown - frontier
+
+        # Without the total, groups are independent and other cells are
+        # assumed as likely to be mines as the average frontier cell
+        if self.total_mines is None:
+            probabilities = dict()
+            for cells, totals, mines in solutions:
+                count = sum(totals.values())
+                for index, cell in enumerate(cells):
+                    probabilities[cell] = sum(
+                        mines[k][index] for k in mines
+                    ) / count
+            elsewhere = (sum(probabilities.values()) / len(probabilities)
+                         if probabilities else 0)
+            return probabilities, elsewhere
+
+        # Weight each number of frontier mines by the ways of placing the
+        # remaining mines among the other cells
+        remaining = self.total_mines - len(self.mines)
+
+        def weight(k):
+            if k > remaining or remaining - k > others:
+                return 0
+            return math.comb(others, remaining - k)
+
+        combined = {0: 1}
+        for _, totals, _ in solutions:
+            combined = convolve(combined, totals)
+        total = sum(n * weight(k) for k, n in combined.items())
+        if total == 0:
+            return dict(), 0
+
+        probabilities = dict()
+        for position, (cells, totals, mines) in enumerate(solutions):
+
+            # Solutions of every other group, by number of mines
+            rest = {0: 1}
+            for other, (_, other_totals, _) in enumerate(solutions):
+                if other != position:
+                    rest = convolve(rest, other_totals)
+
+            for index, cell in enumerate(cells):
+                probabilities[cell] = sum(
+                    mines[k][index] * n * weight(k + j)
+                    for k in mines for j, n in rest.items()
+                ) / total
+
+        elsewhere = 0
+        if others:
+            elsewhere = sum(
+                n * weight(k) * (remaining - k)
+                for k, n in combined.items()
+            ) / (others * total)
+
+        return probabilities, elsewhere
     
     def cell_neighbours(self, cell: tuple) -> set[tuple]:
         """Return cell neighbours"""
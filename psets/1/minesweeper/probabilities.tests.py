@@ -0,0 +1,57 @@
+import itertools
+import random
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+# Small boards, so that every placement of the mines can be listed
+HEIGHT = 5
+WIDTH = 5
+MINES = 5
+BOARDS = 150
+
+
+def brute_force(game, ai):
+    """
+    Returns the probability of each cell not played being a mine, over
+    every placement of the mines that agrees with the counts seen so far.
+    """
+    cells = [(i, j) for i in range(HEIGHT) for j in range(WIDTH)
+             if (i, j) not in ai.moves_made]
+    seen = {cell: game.nearby_mines(cell) for cell in ai.moves_made}
+    mined = dict.fromkeys(cells, 0)
+    total = 0
+    for placement in itertools.combinations(cells, MINES):
+        placement = set(placement)
+        if all(len(ai.cell_neighbours(cell) & placement) == count
+               for cell, count in seen.items()):
+            total += 1
+            for cell in placement:
+                mined[cell] += 1
+    return {cell: mined[cell] / total for cell in cells}
+
+
+# Open a few safe cells of random boards one at a time, then compare the
+# risk the player gives each unknown cell with brute force enumeration
+failures = 0
+for seed in range(BOARDS):
+    random.seed(seed)
+    game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
+    ai = MinesweeperAI(height=HEIGHT, width=WIDTH, mines=MINES)
+
+    hidden = [(i, j) for i in range(HEIGHT) for j in range(WIDTH)
+              if not game.is_mine((i, j))]
+    for cell in random.sample(hidden, random.randint(1, 8)):
+        if cell not in ai.moves_made:
+            ai.add_knowledge(cell, game.nearby_mines(cell))
+
+    expected = brute_force(game, ai)
+    probabilities, elsewhere = ai.mine_probabilities(len(ai.unknown))
+    for cell in ai.unknown:
+        found = probabilities.get(cell, elsewhere)
+        if abs(found - expected[cell]) > 1e-9:
+            failures += 1
+            print(f"board {seed}: {cell} has risk {found:.6f}, "
+                  f"expected {expected[cell]:.6f}")
+            break
+
+print(f"{failures} boards differ from brute force enumeration")
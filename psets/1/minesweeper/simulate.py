@@ -0,0 +1,101 @@
+import multiprocessing
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+HEIGHT = 8
+WIDTH = 8
+MINES = 8
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) not in (2, 5):
+        sys.exit("Usage: python simulate.py games [height width mines]")
+    games = int(sys.argv[1])
+    height, width, mines = HEIGHT, WIDTH, MINES
+    if len(sys.argv) == 5:
+        height, width = int(sys.argv[2]), int(sys.argv[3])
+
+        # Mines may be given as a count or as a density below 1
+        mines = float(sys.argv[4])
+        mines = round(mines * height * width) if mines < 1 else int(mines)
+
+    # Tally results as games finish
+    wins = 0
+    moves = 0
+    inference = 0.0
+    start = time.perf_counter()
+    for result in simulate(games, height, width, mines):
+        wins += result["won"]
+        moves += result["moves"]
+        inference += result["inference"]
+    elapsed = time.perf_counter() - start
+
+    print(f"Board: {height}x{width} with {mines} mines")
+    print(f"Games: {games} in {elapsed:.2f}s")
+    print(f"Win rate: {wins / games:.2%}")
+    print(f"Moves/sec: {moves / elapsed:.0f}")
+    if moves:
+        print(f"Inference per move: {1000 * inference / moves:.3f}ms")
+
+
+def simulate(games, height, width, mines, processes=None):
+    """
+    Plays `games` seeded games across a pool of processes, yielding the
+    result of each one as it finishes.
+    """
+    tasks = ((seed, height, width, mines) for seed in range(games))
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(
+            play_task, tasks, chunksize=min(64, max(1, games // 256))
+        )
+
+
+def play_task(task):
+    return play(*task)
+
+
+def play(seed, height, width, mines):
+    """
+    Plays one game with the AI on a board generated from `seed`.
+    Returns whether the game was won, how many moves were made and the
+    time spent adding knowledge.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines)
+
+    moves = 0
+    inference = 0.0
+    won = False
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+
+        # No move left means every safe cell has been revealed
+        if move is None:
+            won = ai.mines == game.mines
+            break
+        if game.is_mine(move):
+            break
+
+        # Open the whole region around the move and learn it in one batch
+        start = time.perf_counter()
+        ai.add_knowledge_batch(game.reveal(move))
+        inference += time.perf_counter() - start
+        moves += 1
+
+        if len(ai.moves_made) == height * width - mines:
+            won = True
+            break
+
+    return {"won": won, "moves": moves, "inference": inference}
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import csv
 import itertools
+import operator
 import sys
 
 PROBS = {
@@ -60,6 +61,9 @@ def main():
         for person in people
     }
 
+    # Probabilities of everyone, computed once for the family
+    tables = transmission_tables(people)
+
     # Loop over all sets of people who might have the trait
     names = set(people)
     for have_trait in powerset(names):
@@ -78,7 +82,7 @@ def main():
             for two_genes in powerset(names - one_gene):
 
                 # Update probabilities with new joint probability
-                p = joint_probability(people, one_gene, two_genes, have_trait)
+                p = joint_probability(people, one_gene, two_genes, have_trait, tables)
                 update(probabilities, one_gene, two_genes, have_trait, p)
 
     # Ensure probabilities sum to 1
@@ -128,7 +132,7 @@ def powerset(s):
     ]
 
 
-def joint_probability(people, one_gene, two_genes, have_trait):
+def joint_probability(people, one_gene, two_genes, have_trait, tables=None):
     """
     Compute and return a joint probability.
 
@@ -138,8 +142,25 @@ def joint_probability(people, one_gene, two_genes, have_trait):
         * everyone not in `one_gene` or `two_gene` does not have the gene, and
         * everyone in set `have_trait` has the trait, and
         * everyone not in set` have_trait` does not have the trait.
+
+    `tables` are the probabilities of each person from
+    `transmission_tables`, looked up instead of computed again when given.
     """
 
+    # Multiply the probability of each person from the tables, in the same
+    # order as below
+    if tables is not None and one_gene.isdisjoint(two_genes):
+        counts = gene_counts(people, one_gene, two_genes)
+        probability: float = 1
+        for person in people:
+            if not counts[person]:
+                probability *= table_probability(tables, person, counts, have_trait)
+        for person in one_gene:
+            probability *= table_probability(tables, person, counts, have_trait)
+        for person in two_genes:
+            probability *= table_probability(tables, person, counts, have_trait)
+        return probability
+
     # Keep track of joint probability (initialize to 1)
     probability: float = 1
 
@@ -301,6 +322,75 @@ def normalize(probabilities):
             probabilities[person]["trait"][False] = not_have_trait_possibility / total_traits_probability 
 
 
+def transmission_tables(people):
+    """
+    Return the probability of each person's genes and trait for every way
+    genes can be spread over the people it depends on, as `joint_probability`
+    computes it.
+
+    `father_mother_passed_gene` only looks at a person, their parents, and
+    the parents of their father, going up the father's side for as long as
+    there are both parents. For each person, the table maps the number of
+    genes of each of those people, in order, and whether the person has the
+    trait to their probability, along with a function picking those numbers
+    out of the genes of everyone.
+    """
+    tables = dict()
+    for person in people:
+        father = people[person]["father"]
+        mother = people[person]["mother"]
+
+        # Everyone the probability depends on
+        depends = [person]
+        if father != None and mother != None:
+            depends += [mother, father]
+            while people[father]["father"] and people[father]["mother"]:
+                for relative in (people[father]["mother"], people[father]["father"]):
+                    if relative not in depends:
+                        depends.append(relative)
+                father = people[father]["father"]
+
+        # Compute the probability once for every spread of genes
+        table = dict()
+        for genes in itertools.product((0, 1, 2), repeat=len(depends)):
+            if len(depends) == 1:
+                gene_probability = PROBS["gene"][genes[0]]
+            else:
+                one_gene = {p for p, g in zip(depends, genes) if g == 1}
+                two_genes = {p for p, g in zip(depends, genes) if g == 2}
+                gene_probability = father_mother_passed_gene(
+                    person, people[person]["father"], mother, one_gene, two_genes, people
+                )
+            key = genes if len(depends) > 1 else genes[0]
+            table[key] = {
+                trait: gene_probability * PROBS["trait"][genes[0]][trait]
+                for trait in (True, False)
+            }
+        tables[person] = (operator.itemgetter(*depends), table)
+
+    return tables
+
+
+def table_probability(tables, person, counts, have_trait):
+    """
+    Return the probability of a person's genes and trait from their table,
+    given the `counts` of genes of everyone.
+    """
+    depends, table = tables[person]
+    return table[depends(counts)][person in have_trait]
+
+
+def gene_counts(people, one_gene, two_genes):
+    """
+    Return the number of genes of everyone, counted the way
+    `father_mother_passed_gene` checks `one_gene` before `two_genes`.
+    """
+    return {
+        person: 1 if person in one_gene else 2 if person in two_genes else 0
+        for person in people
+    }
+
+
 def father_mother_passed_gene(person: str, father: str, mother: str, one_gene, two_genes, people):
     """Return the probability of the mother and father passing theis genes.
     Basically, there are two ways this can happen, 
@@ -0,0 +1,281 @@
+import heapq
+import itertools
+import sys
+
+from heredity import PROBS, load_data
+
+# Number of copies of the gene a person can have
+GENES = (0, 1, 2)
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python inference.py data.csv")
+    people = load_data(sys.argv[1])
+
+    probabilities = infer(people)
+
+    # Print results
+    for person in people:
+        print(f"{person}:")
+        for field in probabilities[person]:
+            print(f"  {field.capitalize()}:")
+            for value in probabilities[person][field]:
+                p = probabilities[person][field][value]
+                print(f"    {value}: {p:.4f}")
+
+
+def infer(people):
+    """
+    Return the gene and trait distribution of every person given the
+    known traits, in the same form as the `probabilities` of heredity.py.
+
+    The family is a Bayesian network where each person's genes depend on
+    the genes of their parents and their trait on their genes. Known
+    traits are folded into the factor of each person's genes, and every
+    marginal is then computed at once by message passing over a junction
+    tree of the family. For families without loops, such as trees, every
+    clique holds at most a person and their parents, so the cost grows
+    linearly with the number of people.
+    """
+    factors = [gene_factor(people, person) for person in people]
+    tree = JunctionTree(list(people), factors)
+
+    probabilities = dict()
+    for person in people:
+        genes = tree.marginal(person)
+        trait = people[person]["trait"]
+        if trait is None:
+            have_trait = sum(genes[gene] * PROBS["trait"][gene][True]
+                             for gene in GENES)
+        else:
+            have_trait = 1 if trait else 0
+        probabilities[person] = {
+            "gene": {gene: genes[gene] for gene in (2, 1, 0)},
+            "trait": {True: have_trait, False: 1 - have_trait}
+        }
+    return probabilities
+
+
+def passing(genes):
+    """
+    Return the probability that a parent with `genes` copies of the gene
+    passes a copy on to their child, mutations included.
+    """
+    mutation = PROBS["mutation"]
+    return {0: mutation, 1: 0.5, 2: 1 - mutation}[genes]
+
+
+def inheritance(genes, mother, father):
+    """
+    Return the probability that a child gets `genes` copies of the gene
+    from parents with `mother` and `father` copies.
+    """
+    from_mother, from_father = passing(mother), passing(father)
+    if genes == 2:
+        return from_mother * from_father
+    if genes == 1:
+        return (from_mother * (1 - from_father)
+                + (1 - from_mother) * from_father)
+    return (1 - from_mother) * (1 - from_father)
+
+
+def gene_factor(people, person):
+    """
+    Return the Factor of a person's genes given their parents' genes,
+    times the probability of their trait if it is known.
+    """
+    mother = people[person]["mother"]
+    father = people[person]["father"]
+    trait = people[person]["trait"]
+
+    if mother is None or father is None:
+        variables = (person,)
+    else:
+        variables = (person, mother, father)
+
+    table = dict()
+    for assignment in itertools.product(GENES, repeat=len(variables)):
+        genes = assignment[0]
+        if len(variables) == 1:
+            probability = PROBS["gene"][genes]
+        else:
+            probability = inheritance(*assignment)
+        if trait is not None:
+            probability *= PROBS["trait"][genes][trait]
+        table[assignment] = probability
+    return Factor(variables, table)
+
+
+class Factor():
+    """
+    Function of the genes of some people, as a table from each assignment
+    of genes to `variables`, in order, to a nonnegative number.
+    """
+
+    def __init__(self, variables, table=None):
+        self.variables = tuple(variables)
+        if table is None:
+            table = dict.fromkeys(
+                itertools.product(GENES, repeat=len(self.variables)), 1
+            )
+        self.table = table
+
+    def __repr__(self):
+        return f"Factor({self.variables})"
+
+    def multiply(self, other):
+        """Return the product of two factors."""
+        variables = self.variables + tuple(
+            v for v in other.variables if v not in self.variables
+        )
+        mine = [variables.index(v) for v in self.variables]
+        theirs = [variables.index(v) for v in other.variables]
+        table = dict()
+        for assignment in itertools.product(GENES, repeat=len(variables)):
+            table[assignment] = (
+                self.table[tuple(assignment[i] for i in mine)]
+                * other.table[tuple(assignment[i] for i in theirs)]
+            )
+        return Factor(variables, table)
+
+    def divide(self, other):
+        """
+        Return this factor divided by a factor over some of its variables,
+        where dividing zero by zero gives zero.
+        """
+        theirs = [self.variables.index(v) for v in other.variables]
+        table = dict()
+        for assignment, value in self.table.items():
+            divisor = other.table[tuple(assignment[i] for i in theirs)]
+            table[assignment] = value / divisor if divisor else 0
+        return Factor(self.variables, table)
+
+    def marginal(self, variables):
+        """
+        Return the factor summed over every variable not in `variables`,
+        scaled to sum to 1 so that long chains of messages do not underflow.
+        """
+        variables = tuple(variables)
+        kept = [self.variables.index(v) for v in variables]
+        table = dict.fromkeys(
+            itertools.product(GENES, repeat=len(variables)), 0
+        )
+        for assignment, value in self.table.items():
+            table[tuple(assignment[i] for i in kept)] += value
+        total = sum(table.values())
+        if total:
+            for assignment in table:
+                table[assignment] /= total
+        return Factor(variables, table)
+
+
+class JunctionTree():
+    """
+    Tree of cliques of people built by eliminating people one at a time,
+    holding the product of `factors` and calibrated by passing messages
+    up to the roots and back down, so that the belief of each clique is
+    the joint distribution of its people, up to a constant.
+    """
+
+    def __init__(self, variables, factors):
+
+        # Moral graph: people are joined when they share a factor
+        neighbours = {v: set() for v in variables}
+        for factor in factors:
+            for u, v in itertools.combinations(factor.variables, 2):
+                neighbours[u].add(v)
+                neighbours[v].add(u)
+
+        # Eliminate people with fewest neighbours first, each leaving a
+        # clique of themselves and their neighbours still in the graph
+        eliminated = elimination_order(neighbours)
+        position = {v: i for i, (v, _) in enumerate(eliminated)}
+        self.cliques = []
+        self.parents = []
+        for v, links in eliminated:
+            clique = (v,) + tuple(sorted(links, key=position.get))
+            self.cliques.append(clique)
+
+            # The parent clique is that of the next neighbour eliminated
+            self.parents.append(position[clique[1]] if len(clique) > 1
+                                else None)
+        self.home = position
+
+        # Every factor goes to the clique of its first eliminated person
+        self.potentials = [Factor(clique) for clique in self.cliques]
+        for factor in factors:
+            i = min(position[v] for v in factor.variables)
+            self.potentials[i] = self.potentials[i].multiply(factor)
+
+        self.calibrate()
+
+    def calibrate(self):
+        """
+        Computes the belief of every clique, passing messages from the
+        leaves up to the roots and then from the roots down to the leaves.
+        """
+        cliques, parents = self.cliques, self.parents
+        beliefs = list(self.potentials)
+
+        # Children come before their parent in elimination order
+        upward = [None] * len(cliques)
+        for i, parent in enumerate(parents):
+            if parent is not None:
+                upward[i] = beliefs[i].marginal(cliques[i][1:])
+                beliefs[parent] = beliefs[parent].multiply(upward[i])
+
+        # Parents are complete once all their children have reported
+        for i in reversed(range(len(cliques))):
+            parent = parents[i]
+            if parent is not None:
+                downward = beliefs[parent].divide(upward[i]).marginal(
+                    cliques[i][1:]
+                )
+                beliefs[i] = beliefs[i].multiply(downward)
+        self.beliefs = beliefs
+
+    def marginal(self, variable):
+        """
+        Return the distribution of one person's genes as a dictionary.
+        """
+        belief = self.beliefs[self.home[variable]].marginal((variable,))
+        return {gene: belief.table[(gene,)] for gene in GENES}
+
+
+def elimination_order(neighbours):
+    """
+    Return an order eliminating every variable of a graph, greedily
+    choosing one with fewest neighbours left, as pairs of each variable
+    and its neighbours left when it is eliminated. Eliminating a variable
+    links all of its neighbours together.
+    """
+    remaining = {v: set(links) for v, links in neighbours.items()}
+    heap = [(len(links), i, v)
+            for i, (v, links) in enumerate(remaining.items())]
+    heapq.heapify(heap)
+    number = {v: i for i, v in enumerate(remaining)}
+    order = []
+    while heap:
+        degree, _, v = heapq.heappop(heap)
+
+        # Skip entries left behind by a variable's degree changing
+        if v not in remaining or degree != len(remaining[v]):
+            continue
+        links = remaining.pop(v)
+        order.append((v, links))
+        for u in links:
+            remaining[u].discard(v)
+        for u, w in itertools.combinations(links, 2):
+            if w not in remaining[u]:
+                remaining[u].add(w)
+                remaining[w].add(u)
+        for u in links:
+            heapq.heappush(heap, (len(remaining[u]), number[u], u))
+    return order
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import functools
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import generators
+from montecarlo import montecarlo_pagerank
+from outofcore import EdgeFile, outofcore_iterate
+from pagerank import DAMPING, iterate_pagerank, sample_pagerank
+from power import METHODS, power_iterate
+
+TIMEOUT = 60
+
+# Pages of the generated graphs, and links per page on average
+SIZES = [1000, 10_000, 100_000, 1_000_000]
+LINKS = 8
+
+# Pages visited by the sampling solvers
+SAMPLES = 1_000_000
+
+# Tolerance of the reference ranks every solver is compared with
+REFERENCE = 1e-12
+
+# Graph families as (name, generator taking pages and a seed)
+FAMILIES = [
+    ("power-law", lambda n, seed: generators.power_law(n, LINKS * n,
+                                                       seed=seed)),
+    ("barabasi", lambda n, seed: generators.barabasi_albert(n, LINKS,
+                                                            seed=seed)),
+    ("dangling", lambda n, seed: generators.dangling(n, LINKS * n,
+                                                     seed=seed)),
+]
+
+
+def run_sample(graph):
+    corpus = graph.to_corpus()
+    start = time.perf_counter()
+    return sample_pagerank(corpus, DAMPING, SAMPLES), start
+
+
+def run_iterate(graph):
+    corpus = graph.to_corpus()
+    start = time.perf_counter()
+    return iterate_pagerank(corpus, DAMPING), start
+
+
+def run_montecarlo(graph):
+    start = time.perf_counter()
+    return montecarlo_pagerank(graph, DAMPING, SAMPLES, seed=0), start
+
+
+def run_outofcore(graph):
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as directory:
+        edges = EdgeFile.from_graph(os.path.join(directory, "edges"), graph)
+        ranks, _ = outofcore_iterate(edges, DAMPING)
+    return ranks, start
+
+
+def run_power(method, graph):
+    start = time.perf_counter()
+    ranks, _ = METHODS[method](graph, DAMPING)
+    return ranks, start
+
+
+# Solvers as (name, function returning ranks of a LinkGraph and the time
+# they started, after any conversion of the graph they need)
+SOLVERS = [
+    ("sample_pagerank", run_sample),
+    ("iterate_pagerank", run_iterate),
+    ("montecarlo", run_montecarlo),
+] + [
+    (method, functools.partial(run_power, method)) for method in METHODS
+] + [
+    ("outofcore", run_outofcore),
+]
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [timeout]")
+    timeout = float(sys.argv[1]) if len(sys.argv) == 2 else TIMEOUT
+
+    print(f"{'graph':<11}{'pages':>9}{'links':>10}  {'solver':<18}"
+          f"{'seconds':>9}{'MB':>8}{'L1 error':>10}")
+
+    for family, generate in FAMILIES:
+
+        # A solver that timed out is not run on larger graphs
+        slow = set()
+        for n in SIZES:
+            graph = generate(n, n)
+            reference, _ = power_iterate(graph, DAMPING, REFERENCE)
+            for solver, solve in SOLVERS:
+                if solver in slow:
+                    error, seconds, memory = "skipped", None, None
+                else:
+                    error, seconds, memory = run(
+                        solve, graph, reference, timeout
+                    )
+                if error == "timeout":
+                    slow.add(solver)
+                seconds = "-" if seconds is None else f"{seconds:.3f}"
+                memory = "-" if memory is None else f"{memory:.1f}"
+                error = error if isinstance(error, str) else f"{error:.1e}"
+                print(f"{family:<11}{n:>9}{graph.edges:>10}  {solver:<18}"
+                      f"{seconds:>9}{memory:>8}{error:>10}", flush=True)
+
+
+def run(solve, graph, reference, timeout):
+    """
+    Solves in a child process, killed after `timeout` seconds.
+    Returns (L1 error, seconds, peak memory in MB), with "timeout" or
+    "failed" in place of the error when no ranks came back.
+    """
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=measure, args=(queue, solve, graph, reference)
+    )
+    start = time.perf_counter()
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.kill()
+        process.join()
+        return "timeout", time.perf_counter() - start, None
+    if process.exitcode:
+        return "failed", time.perf_counter() - start, None
+    return queue.get()
+
+
+def measure(queue, solve, graph, reference):
+    """Solves, and reports the L1 error, seconds and peak memory."""
+    ranks, start = solve(graph)
+    seconds = time.perf_counter() - start
+    if isinstance(ranks, dict):
+        ranks = np.array([ranks.get(page, 0) for page in graph.pages])
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((np.abs(ranks - reference).sum(), seconds, memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from crawler import BATCH, list_pages, page_links
+from graph import LinkGraph
+
+# Cache file kept inside each corpus directory
+CACHE = ".pagerank-cache.npz"
+
+# Bumped whenever the layout of the cache changes
+VERSION = 1
+
+# Separator of the names stored in the cache, which no file name contains
+SEPARATOR = "\0"
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python cache.py corpus")
+
+    start = time.perf_counter()
+    graph, parsed = load_graph(sys.argv[1], report=True)
+    elapsed = time.perf_counter() - start
+
+    print(f"Pages: {len(graph)} ({parsed} parsed)")
+    print(f"Links: {graph.edges}")
+    print(f"Time: {elapsed:.3f}s")
+
+
+def load_graph(directory, processes=None, report=False):
+    """
+    Returns the LinkGraph of a directory of HTML pages, parsing only the
+    pages whose name, modification time or size changed since the graph
+    was last cached, and updating the cache.
+
+    With `report`, also returns how many pages were parsed.
+    """
+    pages = list_pages(directory)
+    stats = [os.stat(os.path.join(directory, page)) for page in pages]
+    mtimes = np.array([stat.st_mtime_ns for stat in stats], dtype=np.int64)
+    sizes = np.array([stat.st_size for stat in stats], dtype=np.int64)
+
+    cached = read_cache(os.path.join(directory, CACHE))
+    names = cached["names"] if cached else []
+    position = {name: i for i, name in enumerate(names)}
+    previous = {page: i for i, page in enumerate(cached["pages"])} \
+        if cached else dict()
+
+    # Reuse the links of unchanged pages, as numbers into `names`
+    links = [None] * len(pages)
+    changed = []
+    for i, page in enumerate(pages):
+        j = previous.get(page)
+        if (j is not None and cached["mtimes"][j] == mtimes[i]
+                and cached["sizes"][j] == sizes[i]):
+            start, end = cached["offsets"][j], cached["offsets"][j + 1]
+            links[i] = cached["links"][start:end]
+        else:
+            changed.append(i)
+
+    # Parse the rest, adding the names they link to
+    paths = [os.path.join(directory, pages[i]) for i in changed]
+    for i, hrefs in zip(changed, parse_pages(paths, processes)):
+        numbers = []
+        for href in hrefs:
+            if href not in position:
+                position[href] = len(names)
+                names.append(href)
+            numbers.append(position[href])
+        links[i] = np.array(numbers, dtype=np.int64)
+
+    offsets = np.zeros(len(pages) + 1, dtype=np.int64)
+    np.cumsum([len(numbers) for numbers in links], out=offsets[1:])
+    links = np.concatenate(links) if links else np.zeros(0, dtype=np.int64)
+
+    if changed or not cached or len(cached["pages"]) != len(pages):
+        names, links = compact(names, links)
+        write_cache(os.path.join(directory, CACHE), {
+            "pages": pages,
+            "mtimes": mtimes,
+            "sizes": sizes,
+            "offsets": offsets,
+            "names": names,
+            "links": links,
+        })
+
+    # Resolve names to pages of the corpus, dropping links outside it
+    index = {page: i for i, page in enumerate(pages)}
+    lookup = np.array([index.get(name, -1) for name in names],
+                      dtype=np.int64)
+    targets = lookup[links] if len(links) else links
+    sources = np.repeat(np.arange(len(pages), dtype=np.int64),
+                        np.diff(offsets))
+    inside = targets >= 0
+    graph = LinkGraph.from_edges(pages, sources[inside], targets[inside])
+
+    if report:
+        return graph, len(changed)
+    return graph
+
+
+def parse_pages(paths, processes=None):
+    """Returns the links of each page, across a pool for many pages."""
+    if len(paths) <= BATCH:
+        return [page_links(path) for path in paths]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(page_links, paths, chunksize=BATCH)
+
+
+def compact(names, links):
+    """Drops the names no link uses any more, renumbering the links."""
+    used = np.bincount(links, minlength=len(names)) > 0
+    if used.all():
+        return names, links
+    renumber = np.cumsum(used) - 1
+    names = [name for name, keep in zip(names, used.tolist()) if keep]
+    return names, renumber[links]
+
+
+def read_cache(path):
+    """Returns the cached graph of a corpus, or None if there is none."""
+    try:
+        with np.load(path) as data:
+            if int(data["version"]) != VERSION:
+                return None
+            return {
+                "pages": unpack(data["pages"]),
+                "mtimes": data["mtimes"],
+                "sizes": data["sizes"],
+                "offsets": data["offsets"],
+                "names": unpack(data["names"]),
+                "links": data["links"],
+            }
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def write_cache(path, cache):
+    """
+    Writes the cached graph of a corpus, replacing the file at once so
+    that an interrupted write leaves the previous cache in place.
+    A corpus that cannot be written to is simply not cached.
+    """
+    arrays = dict(cache, version=VERSION)
+    arrays["pages"] = pack(cache["pages"])
+    arrays["names"] = pack(cache["names"])
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temporary, path)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def pack(strings):
+    """Stores a list of strings as one array of UTF-8 bytes."""
+    encoded = "".join(string + SEPARATOR for string in strings).encode(
+        "utf-8", "surrogateescape"
+    )
+    return np.frombuffer(encoded, dtype=np.uint8)
+
+
+def unpack(array):
+    """Reads back a list of strings stored by `pack`."""
+    strings = array.tobytes().decode("utf-8", "surrogateescape")
+    return strings.split(SEPARATOR)[:-1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import multiprocessing
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from graph import LinkGraph
+
+# Characters read from a page at a time
+CHUNK = 1 << 16
+
+# Most pages parsed by one task
+BATCH = 256
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python crawler.py corpus")
+
+    start = time.perf_counter()
+    graph = crawl_graph(sys.argv[1])
+    elapsed = time.perf_counter() - start
+
+    print(f"Pages: {len(graph)}")
+    print(f"Links: {graph.edges}")
+    print(f"Time: {elapsed:.3f}s")
+    print(f"Pages/sec: {len(graph) / elapsed:.0f}")
+
+
+class LinkTokenizer():
+    """
+    Collects the href of every anchor tag of a page fed in chunks.
+
+    Only anchor tags are matched, with a pattern that cannot run past the
+    end of a tag, and a tag cut by the end of a chunk is kept for the next.
+    """
+
+    ANCHOR = re.compile(r"<a\s[^<>]*>", re.IGNORECASE)
+    HREF = re.compile(
+        r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+        re.IGNORECASE
+    )
+
+    def __init__(self):
+        self.links = []
+        self.pending = ""
+
+    def feed(self, chunk):
+        text = self.pending + chunk
+        end = 0
+        for anchor in self.ANCHOR.finditer(text):
+            href = self.HREF.search(anchor.group())
+            if href:
+                self.links.append(href.group(1) or href.group(2)
+                                  or href.group(3) or "")
+            end = anchor.end()
+
+        # Keep an unfinished tag, unless it is too long to be one
+        start = text.rfind("<", end)
+        if start == -1 or ">" in text[start:] or len(text) - start > CHUNK:
+            self.pending = ""
+        else:
+            self.pending = text[start:]
+
+    def close(self):
+        self.pending = ""
+
+
+def crawl(directory, processes=None):
+    """
+    Parse a directory of HTML pages and check for links to other pages.
+    Return a dictionary where each key is a page, and values are
+    a set of all other pages in the corpus that are linked to by the page.
+    """
+    return crawl_graph(directory, processes).to_corpus()
+
+
+def crawl_graph(directory, processes=None):
+    """
+    Parse a directory of HTML pages, across a pool of processes for many
+    pages, and return the links between them as a LinkGraph.
+    """
+    pages = list_pages(directory)
+
+    # Hand out pages in batches, so each result carries many links at once.
+    # A single batch of pages is parsed here, without starting a pool
+    processes = processes or os.cpu_count() or 1
+    if len(pages) <= BATCH:
+        processes = 1
+    batch = max(1, min(BATCH, len(pages) // (4 * processes)))
+    tasks = [(i, min(i + batch, len(pages)))
+             for i in range(0, len(pages), batch)]
+
+    if processes == 1:
+        load_pages(directory, pages)
+        edges = [parse_task(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(
+            processes, load_pages, (directory, pages)
+        ) as pool:
+            edges = list(pool.imap_unordered(parse_task, tasks))
+
+    if not edges:
+        return LinkGraph.from_edges(pages, [], [])
+    sources, targets = zip(*edges)
+    return LinkGraph.from_edges(
+        pages, np.concatenate(sources), np.concatenate(targets)
+    )
+
+
+def list_pages(directory):
+    """Returns the sorted names of the HTML pages in a directory."""
+    return sorted(
+        filename for filename in os.listdir(directory)
+        if filename.endswith(".html")
+    )
+
+
+# Directory and number of each page in the corpus, for the current process
+DIRECTORY = None
+PAGES = None
+INDEX = None
+
+
+def load_pages(directory, pages):
+    global DIRECTORY, PAGES, INDEX
+    DIRECTORY = directory
+    PAGES = pages
+    INDEX = {page: i for i, page in enumerate(pages)}
+
+
+def parse_task(task):
+    """Returns the sources and targets of the links of a batch of pages."""
+    sources = []
+    targets = []
+    for i in range(*task):
+        links = parse_links(os.path.join(DIRECTORY, PAGES[i]), INDEX)
+        sources.extend([i] * len(links))
+        targets.extend(links)
+    return (np.array(sources, dtype=np.int64),
+            np.array(targets, dtype=np.int64))
+
+
+def parse_links(path, index):
+    """
+    Returns a list of the numbers of the pages in `index` that a page
+    links to.
+    """
+    return [index[link] for link in page_links(path) if link in index]
+
+
+def page_links(path):
+    """Streams a page through the tokenizer, and returns its links."""
+    parser = LinkTokenizer()
+    with open(path) as f:
+        while chunk := f.read(CHUNK):
+            parser.feed(chunk)
+    parser.close()
+    return parser.links
+
+
+if __name__ == "__main__":
+    main()
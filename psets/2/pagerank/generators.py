@@ -0,0 +1,78 @@
+import numpy as np
+
+from graph import LinkGraph
+
+# Exponent of the in-degree and out-degree distributions of the web
+EXPONENT = 2.1
+
+
+def power_law(n, links, exponent=EXPONENT, seed=None):
+    """
+    Returns a LinkGraph of `n` pages with about `links` links, where the
+    number of links into and out of pages follows a power law.
+
+    Every page gets a weight decreasing as a power of its position, and
+    each link joins a source and a target drawn by weight, so that page
+    degrees fall off with `exponent` as on the web. Sources and targets
+    are weighted in different orders, so popular pages need not link much.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.arange(1, n + 1) ** (-1 / (exponent - 1))
+    weights /= weights.sum()
+    sources = rng.permutation(n)[rng.choice(n, links, p=weights)]
+    targets = rng.permutation(n)[rng.choice(n, links, p=weights)]
+    return LinkGraph.from_edges(names(n), sources, targets)
+
+
+def barabasi_albert(n, m, seed=None):
+    """
+    Returns a LinkGraph of `n` pages grown by preferential attachment:
+    pages are added one at a time, each linking to `m` earlier pages
+    chosen in proportion to how many links they already have.
+
+    Choosing in proportion to degree is choosing an end of an earlier
+    link uniformly, so every link copies an end of a random earlier link.
+    Copying the target of a link that is itself a copy is resolved by
+    following the copies back, all links at once. The first page has
+    nothing to link to, and repeated choices of a page become one link.
+    """
+    rng = np.random.default_rng(seed)
+    sources = np.repeat(np.arange(n, dtype=np.int64), m)
+
+    # End 2k of the links is the source of link k and end 2k + 1 its target
+    ends = (rng.random(n * m) * 2 * m * sources).astype(np.int64)
+    targets = np.where(ends % 2 == 0, sources[ends // 2], -1)
+    copied = ends // 2
+    targets[:m] = 0
+
+    # Follow copies of targets back until they reach a known page
+    pending = np.flatnonzero(targets < 0)
+    while len(pending):
+        known = targets[copied[pending]]
+        done = known >= 0
+        targets[pending[done]] = known[done]
+        pending = pending[~done]
+        copied[pending] = copied[copied[pending]]
+
+    return LinkGraph.from_edges(names(n), sources, targets)
+
+
+def dangling(n, links, fraction=0.5, exponent=EXPONENT, seed=None):
+    """
+    Returns a LinkGraph of `n` pages with about `links` links following a
+    power law, where a `fraction` of the pages have no links at all, like
+    the documents and pages not yet crawled at the edge of the web.
+    """
+    rng = np.random.default_rng(seed)
+    linking = max(1, n - int(fraction * n))
+    weights = np.arange(1, n + 1) ** (-1 / (exponent - 1))
+    weights /= weights.sum()
+    order = rng.permutation(n)
+    sources = order[rng.integers(0, linking, links)]
+    targets = rng.permutation(n)[rng.choice(n, links, p=weights)]
+    return LinkGraph.from_edges(names(n), sources, targets)
+
+
+def names(n):
+    """Returns the names of `n` generated pages."""
+    return [f"{i}.html" for i in range(n)]
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+class LinkGraph():
+    """
+    Link graph of a corpus in compressed sparse row form.
+
+    Pages are numbered by their position in `pages`, and the links of
+    page `i` are `targets[offsets[i]:offsets[i + 1]]`, sorted and without
+    duplicates or links from a page to itself.
+    """
+
+    def __init__(self, pages, offsets, targets, index=None):
+        self.pages = list(pages)
+        if index is None:
+            index = {page: i for i, page in enumerate(self.pages)}
+        self.index = index
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self._sources = None
+        self._reverse = None
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __repr__(self):
+        return f"LinkGraph({len(self)} pages, {self.edges} links)"
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """Builds the graph of a dictionary from each page to its links."""
+        pages = list(corpus)
+        index = {page: i for i, page in enumerate(pages)}
+        sources = []
+        targets = []
+        for i, page in enumerate(pages):
+            links = [index[link] for link in corpus[page] if link in index]
+            sources.extend([i] * len(links))
+            targets.extend(links)
+        return cls.from_edges(pages, sources, targets)
+
+    @classmethod
+    def from_edges(cls, pages, sources, targets):
+        """
+        Builds the graph of `pages` from parallel arrays of link sources
+        and targets, given as page numbers.
+        """
+        n = len(pages)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        # Drop links to the page itself, then sort and remove duplicates
+        keep = sources != targets
+        keys = np.sort(sources[keep] * n + targets[keep])
+        keys = keys[np.flatnonzero(np.diff(keys, prepend=-1))]
+        sources, targets = np.divmod(keys, max(n, 1))
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        return cls(pages, offsets, targets)
+
+    @property
+    def edges(self):
+        """Number of links in the graph."""
+        return len(self.targets)
+
+    @property
+    def outdegree(self):
+        """Number of links from each page."""
+        return np.diff(self.offsets)
+
+    @property
+    def dangling(self):
+        """Boolean mask of the pages without links."""
+        return self.outdegree == 0
+
+    @property
+    def sources(self):
+        """Source page of every link, parallel to `targets`."""
+        if self._sources is None:
+            self._sources = np.repeat(
+                np.arange(len(self), dtype=np.int64), self.outdegree
+            )
+        return self._sources
+
+    def reverse(self):
+        """
+        Returns the graph with every link turned around, so that the links
+        of a page are the pages linking to it.
+        """
+        if self._reverse is None:
+            self._reverse = LinkGraph.from_edges(
+                self.pages, self.targets, self.sources
+            )
+        return self._reverse
+
+    def links(self, i):
+        """Returns the page numbers linked to by page `i`."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def to_corpus(self):
+        """Returns the graph as a dictionary from each page to its links."""
+        return {
+            page: {self.pages[j] for j in self.links(i)}
+            for i, page in enumerate(self.pages)
+        }
+
+    def ranks(self, vector):
+        """Returns a rank vector as a dictionary from page to rank."""
+        return dict(zip(self.pages, vector.tolist()))
+
+
+def link_graph(corpus):
+    """Returns `corpus` as a LinkGraph, building one from a dictionary."""
+    if isinstance(corpus, LinkGraph):
+        return corpus
+    return LinkGraph.from_corpus(corpus)
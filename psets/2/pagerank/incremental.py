@@ -0,0 +1,298 @@
+import sys
+import time
+
+import numpy as np
+
+from graph import LinkGraph, link_graph
+from pagerank import DAMPING
+from power import power_iterate
+
+# Largest residual left on a page, relative to the rank every page gets
+# from jumping to it at random
+TOLERANCE = 1e-4
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python incremental.py pages links")
+    pages, links = int(sys.argv[1]), int(sys.argv[2])
+
+    # Random graph, then a handful of links moved around
+    rng = np.random.default_rng(0)
+    graph = LinkGraph.from_edges(
+        range(pages), rng.integers(0, pages, links),
+        rng.integers(0, pages, links)
+    )
+    start = time.perf_counter()
+    ranks = IncrementalPageRank(graph, DAMPING)
+    print(f"Full solve: {time.perf_counter() - start:.3f}s")
+
+    delta = LinkDelta(
+        added_links=zip(rng.integers(0, pages, 10).tolist(),
+                        rng.integers(0, pages, 10).tolist()),
+        removed_links=[(i, j) for i in range(5) for j in graph.links(i)]
+    )
+    start = time.perf_counter()
+    pushes = ranks.pushes
+    ranks.update(delta)
+    print(f"Update with {delta}: {time.perf_counter() - start:.3f}s, "
+          f"{ranks.pushes - pushes} pushes")
+
+
+class LinkDelta():
+    """
+    Change to the links of a corpus: pages added or removed, and links
+    added or removed as (source, target) pairs of page names.
+    Removing a page also removes every link from or to it.
+    """
+
+    def __init__(self, added_pages=(), removed_pages=(), added_links=(),
+                 removed_links=()):
+        self.added_pages = list(added_pages)
+        self.removed_pages = set(removed_pages)
+        self.added_links = list(added_links)
+        self.removed_links = list(removed_links)
+
+    def __repr__(self):
+        return (f"LinkDelta(+{len(self.added_pages)} pages, "
+                f"-{len(self.removed_pages)} pages, "
+                f"+{len(self.added_links)} links, "
+                f"-{len(self.removed_links)} links)")
+
+
+class IncrementalPageRank():
+    """
+    PageRank of a corpus that is kept up to date as its links change.
+
+    Ranks are kept unnormalised as `scores`, the solution of
+    scores = 1 + damping_factor * (scores shared out along links),
+    where pages without links share nothing. Normalising the scores gives
+    the PageRank of the corpus, with pages without links linking to every
+    page. `residual` holds what is still to be pushed into the scores, so
+    a change of links only adds residual around the pages it touches, and
+    pushing spreads it only as far as it stays above the tolerance.
+    """
+
+    def __init__(self, corpus, damping_factor, ranks=None,
+                 tolerance=TOLERANCE):
+        self.graph = link_graph(corpus)
+        self.damping_factor = damping_factor
+        self.tolerance = tolerance
+        self.pushes = 0
+
+        # Start from previous ranks, or solve from scratch without them
+        if ranks is None:
+            vector, _ = power_iterate(self.graph, damping_factor)
+        else:
+            vector = np.array([ranks[page] for page in self.graph.pages])
+            vector = vector / vector.sum()
+
+        # Scores of a solution sum to n / (1 - d + d * dangling rank)
+        n = len(self.graph)
+        dangling = vector[self.graph.dangling].sum()
+        self.scores = vector * n / (
+            1 - damping_factor + damping_factor * dangling
+        )
+        self.residual = 1 + damping_factor * received(
+            self.graph, self.scores
+        ) - self.scores
+        self.push(np.flatnonzero(np.abs(self.residual) > tolerance))
+
+    def ranks(self):
+        """Returns the PageRank of each page as a dictionary."""
+        return self.graph.ranks(self.scores / self.scores.sum())
+
+    def update(self, delta):
+        """
+        Changes the links of the corpus by a LinkDelta, and brings the
+        ranks up to date by pushing residual from the pages it touched.
+        """
+        graph = self.graph
+        d = self.damping_factor
+
+        # Pages whose links change, in the numbering of the old graph
+        changed = changed_pages(graph, delta)
+
+        # Take back what those pages used to share
+        touched = set()
+        for i in changed:
+            links = graph.links(i)
+            if len(links):
+                self.residual[links] -= d * self.scores[i] / len(links)
+                touched.update(links.tolist())
+
+        # Carry scores and residual over to the new numbering of pages,
+        # where added pages have no score and get their random jumps
+        following, numbers = apply_delta(graph, delta)
+        kept = numbers >= 0
+        scores = np.zeros(len(following))
+        residual = np.ones(len(following))
+        scores[numbers[kept]] = self.scores[kept]
+        residual[numbers[kept]] = self.residual[kept]
+        self.graph, self.scores, self.residual = following, scores, residual
+        touched = {i for i in numbers[list(touched)].tolist() if i >= 0}
+        touched.update(range(np.count_nonzero(kept), len(following)))
+
+        # Share again from the pages whose links changed
+        for i in numbers[list(changed)].tolist():
+            links = following.links(i) if i >= 0 else ()
+            if len(links):
+                residual[links] += d * scores[i] / len(links)
+                touched.update(links.tolist())
+
+        touched = np.array(sorted(touched), dtype=np.int64)
+        self.push(touched[np.abs(residual[touched]) > self.tolerance])
+
+    def push(self, pages):
+        """
+        Moves residual into scores, starting from `pages`, until no page
+        has more than the tolerance left. Every page over the tolerance is
+        pushed at once in each round, as one gather over its links.
+        """
+        d = self.damping_factor
+        graph = self.graph
+        n = len(graph)
+        outdegree = graph.outdegree
+        pages = np.asarray(pages, dtype=np.int64)
+        while len(pages):
+            values = self.residual[pages]
+            self.residual[pages] = 0
+            self.scores[pages] += values
+            self.pushes += len(pages)
+
+            # Pass the damped residual on along every link of those pages
+            lengths = outdegree[pages]
+            starts = np.repeat(
+                graph.offsets[pages] - np.cumsum(lengths) + lengths, lengths
+            )
+            targets = graph.targets[np.arange(len(starts)) + starts]
+            shares = np.repeat(
+                d * values / np.maximum(lengths, 1), lengths
+            )
+
+            # Small rounds only look at the pages they reached
+            if len(targets) < n // 64:
+                np.add.at(self.residual, targets, shares)
+                reached = np.unique(targets)
+                pages = reached[
+                    np.abs(self.residual[reached]) > self.tolerance
+                ]
+            else:
+                self.residual += np.bincount(
+                    targets, weights=shares, minlength=n
+                )
+                pages = np.flatnonzero(
+                    np.abs(self.residual) > self.tolerance
+                )
+
+
+def update_pagerank(corpus, ranks, delta, damping_factor,
+                    tolerance=TOLERANCE):
+    """
+    Return PageRank values for each page once the links of `corpus` change
+    by `delta`, starting from the `ranks` it had before the change.
+    """
+    incremental = IncrementalPageRank(corpus, damping_factor, ranks, tolerance)
+    incremental.update(delta)
+    return incremental.ranks()
+
+
+def changed_pages(graph, delta):
+    """
+    Returns the numbers of the pages of a LinkGraph whose links a LinkDelta
+    changes, including removed pages and the pages linking to them.
+    """
+    removed = [graph.index[page] for page in delta.removed_pages
+               if page in graph.index]
+    changed = set(removed)
+    for i in removed:
+        changed.update(graph.reverse().links(i).tolist())
+    for source, _ in delta.added_links + delta.removed_links:
+        if source in graph.index:
+            changed.add(graph.index[source])
+    return changed
+
+
+def apply_delta(graph, delta):
+    """
+    Returns the LinkGraph changed by a LinkDelta, and the new number of
+    every page of the old graph, or -1 for removed pages. Kept pages keep
+    their order, and added pages come after them.
+
+    Only the rows of pages whose links change are rebuilt, and the runs of
+    rows between them are copied over whole.
+    """
+    removed = {graph.index[page] for page in delta.removed_pages
+               if page in graph.index}
+    added = [page for page in dict.fromkeys(delta.added_pages)
+             if page not in graph.index]
+
+    # Renumber pages, which only needs new numbers if some were removed
+    if removed:
+        kept = np.array([i for i in range(len(graph)) if i not in removed],
+                        dtype=np.int64)
+        numbers = np.full(len(graph), -1, dtype=np.int64)
+        numbers[kept] = np.arange(len(kept))
+        pages = [graph.pages[i] for i in kept.tolist()] + added
+        index = {page: i for i, page in enumerate(pages)}
+    else:
+        kept = numbers = np.arange(len(graph), dtype=np.int64)
+        pages = graph.pages + added
+        index = graph.index
+        if added:
+            index = dict(index)
+            index.update((page, len(graph) + i) for i, page in enumerate(added))
+
+    # New links of every page whose links change, added ones included
+    rows = dict()
+    for i in changed_pages(graph, delta):
+        if numbers[i] >= 0:
+            links = numbers[graph.links(i)]
+            rows[int(numbers[i])] = set(links[links >= 0].tolist())
+    for source, target in delta.removed_links:
+        if index.get(source) in rows and target in index:
+            rows[index[source]].discard(index[target])
+    for source, target in delta.added_links:
+        if source in index and target in index and source != target:
+            rows.setdefault(index[source], set()).add(index[target])
+
+    outdegree = np.zeros(len(pages), dtype=np.int64)
+    outdegree[:len(kept)] = graph.outdegree[kept]
+    for i, links in rows.items():
+        outdegree[i] = len(links)
+    offsets = np.zeros(len(pages) + 1, dtype=np.int64)
+    np.cumsum(outdegree, out=offsets[1:])
+    targets = np.empty(offsets[-1], dtype=np.int64)
+
+    # Runs of kept rows that neither change nor follow a removed page
+    gaps = np.searchsorted(kept, sorted(removed)).tolist()
+    breaks = sorted({i for i in set(rows) | set(gaps) if i < len(kept)}
+                    | {len(kept)})
+    start = 0
+    for end in breaks:
+        if start < end:
+            first, last = offsets[start], offsets[end]
+            old = graph.offsets[kept[start]]
+            links = graph.targets[old:old + last - first]
+            targets[first:last] = numbers[links] if removed else links
+        start = end + (end in rows)
+    for i, links in rows.items():
+        targets[offsets[i]:offsets[i + 1]] = sorted(links)
+
+    return LinkGraph(pages, offsets, targets, index), numbers
+
+
+def received(graph, scores):
+    """Returns what every page receives from the pages linking to it."""
+    n = len(graph)
+    outdegree = graph.outdegree
+    share = np.divide(scores, outdegree, out=np.zeros(n),
+                      where=outdegree > 0)
+    return np.bincount(graph.targets, weights=share[graph.sources],
+                       minlength=n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from graph import link_graph
+from cache import load_graph
+from pagerank import DAMPING
+
+SAMPLES = 10_000_000
+WALKERS = 65536
+
+# Positions recorded between two tallies of the visited pages
+BUFFER = 1 << 22
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python montecarlo.py corpus [samples]")
+    samples = int(sys.argv[2]) if len(sys.argv) == 3 else SAMPLES
+
+    corpus = load_graph(sys.argv[1])
+    start = time.perf_counter()
+    ranks = montecarlo_pagerank(corpus, DAMPING, samples)
+    elapsed = time.perf_counter() - start
+
+    print(f"PageRank Results from Sampling (n = {samples}, {elapsed:.3f}s)")
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+
+
+def montecarlo_pagerank(corpus, damping_factor, n, walkers=WALKERS,
+                        processes=None, seed=None):
+    """
+    Return PageRank values for each page by sampling about `n` pages with
+    many random surfers moving at once, each starting at a page at random.
+
+    The surfers are split across `processes` worker processes, each with
+    its own random stream spawned from `seed`.
+    Return a dictionary where keys are page names, and values are
+    their estimated PageRank value, like `sample_pagerank`.
+    """
+    graph = link_graph(corpus)
+    processes = processes or multiprocessing.cpu_count()
+    processes = max(1, min(processes, -(-n // walkers)))
+
+    # Split the samples evenly, giving each share an independent stream
+    shares = [n // processes + (i < n % processes) for i in range(processes)]
+    streams = np.random.SeedSequence(seed).spawn(processes)
+    tasks = [(stream, share, walkers, damping_factor)
+             for stream, share in zip(streams, shares)]
+
+    if processes == 1:
+        init_worker(graph)
+        counts = [walk_task(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(processes, init_worker, (graph,)) as pool:
+            counts = pool.map(walk_task, tasks)
+
+    counts = sum(counts)
+    total = int(counts.sum())
+    return {
+        graph.pages[i]: count / total
+        for i, count in enumerate(counts.tolist()) if count
+    }
+
+
+# Link graph of the current process, loaded once rather than per task
+GRAPH = None
+
+
+def init_worker(graph):
+    global GRAPH
+    GRAPH = graph
+
+
+def walk_task(task):
+    return walk(GRAPH, *task)
+
+
+def walk(graph, stream, samples, walkers, damping_factor):
+    """
+    Moves up to `walkers` surfers together until about `samples` pages have
+    been visited in total, and returns how many times each page was visited.
+
+    Every jump to a page at random starts a fresh walk, so once enough
+    pages have been visited each surfer only finishes the walk it is on.
+    Stopping surfers part way through a walk would overcount the pages
+    close to where walks start.
+    """
+    rng = np.random.default_rng(stream)
+    pages = len(graph)
+    outdegree = graph.outdegree
+    counts = np.zeros(pages, dtype=np.int64)
+
+    walkers = max(1, min(walkers, samples))
+    positions = rng.integers(0, pages, walkers)
+    buffer = np.empty(max(BUFFER, walkers), dtype=np.int64)
+    filled = 0
+
+    while len(positions):
+
+        # Record where every surfer is
+        if filled + len(positions) > len(buffer):
+            counts += np.bincount(buffer[:filled], minlength=pages)
+            filled = 0
+        buffer[filled:filled + len(positions)] = positions
+        filled += len(positions)
+        samples -= len(positions)
+
+        # Follow a random link with probability damping_factor, otherwise
+        # jump to any page, as a page without links always does
+        degree = outdegree[positions]
+        follow = (rng.random(len(positions)) < damping_factor) & (degree > 0)
+        choice = (rng.random(len(positions)) * degree).astype(np.int64)
+        links = graph.offsets[positions[follow]] + choice[follow]
+        positions = rng.integers(0, pages, len(positions))
+        positions[follow] = graph.targets[links]
+
+        # With enough samples, surfers stop instead of jumping
+        if samples <= 0:
+            positions = positions[follow]
+
+    counts += np.bincount(buffer[:filled], minlength=pages)
+    return counts
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from cache import load_graph
+from pagerank import DAMPING
+
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 1000
+
+# Links read from disk at a time
+BLOCK = 1 << 22
+
+# Page numbers are stored as 32 bit integers on disk
+TARGET = np.dtype("<i4")
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python outofcore.py edges [corpus]")
+
+    # Write the links of a corpus first, if one is given
+    if len(sys.argv) == 3:
+        EdgeFile.from_graph(sys.argv[1], load_graph(sys.argv[2]))
+
+    edges = EdgeFile(sys.argv[1])
+    start = time.perf_counter()
+    ranks, iterations = outofcore_iterate(edges, DAMPING)
+    elapsed = time.perf_counter() - start
+
+    print(f"PageRank Results from Out-of-Core Iteration "
+          f"({len(edges)} pages, {edges.edges} links, "
+          f"{iterations} iterations, {elapsed:.3f}s)")
+    pages = edges.pages()
+    for i in np.argsort(-ranks, kind="stable")[:20].tolist():
+        print(f"  {pages[i]}: {ranks[i]:.4f}")
+
+
+class EdgeFile():
+    """
+    Links of a corpus stored on disk, sorted by source page.
+
+    `path` holds the target of every link as a memory-mapped array, with
+    the links of page `i` at `offsets[i]:offsets[i + 1]`, sorted and
+    without duplicates or links from a page to itself. `path.offsets.npy`
+    holds the offsets and `path.pages` the page names, one per line.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = np.load(f"{path}.offsets.npy", mmap_mode="r")
+        self.targets = np.memmap(path, dtype=TARGET, mode="r",
+                                 shape=(int(self.offsets[-1]),)) \
+            if self.offsets[-1] else np.zeros(0, dtype=TARGET)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return f"EdgeFile({self.path!r}, {len(self)} pages, {self.edges} links)"
+
+    @property
+    def edges(self):
+        """Number of links in the file."""
+        return int(self.offsets[-1])
+
+    def pages(self):
+        """Returns the list of page names."""
+        with open(f"{self.path}.pages", encoding="utf-8") as f:
+            return f.read().split("\n")[:-1]
+
+    def blocks(self, size=BLOCK):
+        """
+        Yields the links in blocks of about `size`, as (first page, sources,
+        targets), never splitting the links of a page across blocks.
+        """
+        offsets = np.asarray(self.offsets)
+        n = len(self)
+        first = 0
+        while first < n:
+            last = int(np.searchsorted(offsets, offsets[first] + size,
+                                       side="right")) - 1
+            last = min(max(last, first + 1), n)
+            start, end = int(offsets[first]), int(offsets[last])
+            sources = np.repeat(np.arange(first, last, dtype=np.int64),
+                                np.diff(offsets[first:last + 1]))
+            yield first, sources, np.asarray(self.targets[start:end])
+            first = last
+
+    @classmethod
+    def create(cls, path, pages, chunks):
+        """
+        Writes the links between `pages` to an edge file and opens it.
+
+        `chunks` is a function returning an iterator over the links in any
+        order, as pairs of source and target arrays of page numbers. It is
+        called twice: once to count the links of every page, and once to
+        place each link straight into its slot of the file, so no more
+        than one chunk of links is ever held in memory.
+        """
+        n = len(pages)
+        with open(f"{path}.pages", "w", encoding="utf-8") as f:
+            for page in pages:
+                f.write(f"{page}\n")
+
+        # Count the links of every page to find where its links go
+        counts = np.zeros(n, dtype=np.int64)
+        for sources, targets in chunks():
+            sources = np.asarray(sources, dtype=np.int64)
+            keep = sources != np.asarray(targets, dtype=np.int64)
+            counts += np.bincount(sources[keep], minlength=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # Place every link, each chunk grouped by source first
+        total = int(offsets[-1])
+        with open(path, "wb") as f:
+            f.truncate(total * TARGET.itemsize)
+        if total:
+            stored = np.memmap(path, dtype=TARGET, mode="r+", shape=(total,))
+            filled = offsets[:-1].copy()
+            for sources, targets in chunks():
+                sources = np.asarray(sources, dtype=np.int64)
+                targets = np.asarray(targets, dtype=np.int64)
+                keep = sources != targets
+                order = np.argsort(sources[keep], kind="stable")
+                sources = sources[keep][order]
+                targets = targets[keep][order]
+
+                # Position of each link among the chunk's links of its page
+                starts = np.flatnonzero(np.diff(sources, prepend=-1))
+                lengths = np.diff(np.append(starts, len(sources)))
+                within = np.arange(len(sources)) - np.repeat(starts, lengths)
+                stored[filled[sources] + within] = targets
+                filled[sources[starts]] += lengths
+            stored.flush()
+            del stored
+            offsets = cls.deduplicate(path, offsets)
+
+        np.save(f"{path}.offsets.npy", offsets)
+        return cls(path)
+
+    @staticmethod
+    def deduplicate(path, offsets):
+        """
+        Sorts the links of every page and removes duplicates, compacting
+        the file in place one block at a time. Returns the new offsets.
+        """
+        n = len(offsets) - 1
+        total = int(offsets[-1])
+        stored = np.memmap(path, dtype=TARGET, mode="r+", shape=(total,))
+        counts = np.zeros(n, dtype=np.int64)
+        written = 0
+        first = 0
+        while first < n:
+            last = int(np.searchsorted(offsets, offsets[first] + BLOCK,
+                                       side="right")) - 1
+            last = min(max(last, first + 1), n)
+            start, end = int(offsets[first]), int(offsets[last])
+            sources = np.repeat(np.arange(first, last, dtype=np.int64),
+                                np.diff(offsets[first:last + 1]))
+            keys = np.sort(sources * n + stored[start:end])
+            keys = keys[np.flatnonzero(np.diff(keys, prepend=-1))]
+            sources, targets = np.divmod(keys, n)
+            counts[first:last] = np.bincount(sources - first,
+                                             minlength=last - first)
+            stored[written:written + len(targets)] = targets
+            written += len(targets)
+            first = last
+        stored.flush()
+        del stored
+        os.truncate(path, written * TARGET.itemsize)
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets
+
+    @classmethod
+    def from_graph(cls, path, graph):
+        """Writes the links of a LinkGraph to an edge file and opens it."""
+        def chunks():
+            for start in range(0, graph.edges, BLOCK):
+                yield (graph.sources[start:start + BLOCK],
+                       graph.targets[start:start + BLOCK])
+        return cls.create(path, graph.pages, chunks)
+
+
+def outofcore_pagerank(edges, damping_factor, tolerance=TOLERANCE,
+                       max_iterations=MAX_ITERATIONS):
+    """
+    Return PageRank values for each page of an edge file, or the path of
+    one, by power iteration reading the links from disk in blocks.
+
+    Return a dictionary where keys are page names, and values are
+    their PageRank value. All PageRank values sum to 1.
+    """
+    if not isinstance(edges, EdgeFile):
+        edges = EdgeFile(edges)
+    ranks, _ = outofcore_iterate(edges, damping_factor, tolerance,
+                                 max_iterations)
+    return dict(zip(edges.pages(), ranks.tolist()))
+
+
+def outofcore_iterate(edges, damping_factor, tolerance=TOLERANCE,
+                      max_iterations=MAX_ITERATIONS):
+    """
+    Runs power iteration over an EdgeFile from uniform ranks, keeping only
+    rank vectors in memory. Returns the rank vector and iterations made.
+    """
+    n = len(edges)
+    outdegree = np.diff(np.asarray(edges.offsets))
+    dangling = outdegree == 0
+    ranks = np.full(n, 1 / n)
+    for iteration in range(1, max_iterations + 1):
+        share = np.divide(ranks, outdegree, out=np.zeros(n),
+                          where=~dangling)
+
+        # Each block of links adds what its pages share with their targets.
+        # Blocks hold at least n links, so adding up the dense counts of
+        # every block costs no more than reading the links
+        following = np.zeros(n)
+        for _, sources, targets in edges.blocks(max(BLOCK, n)):
+            following += np.bincount(targets, weights=share[sources],
+                                     minlength=n)
+
+        # A page without links links to every page, including itself
+        following = (1 - damping_factor) / n + damping_factor * (
+            following + ranks[dangling].sum() / n
+        )
+        change = np.abs(following - ranks).sum()
+        ranks = following
+        if change < tolerance:
+            break
+    return ranks, iteration
+
+
+if __name__ == "__main__":
+    main()
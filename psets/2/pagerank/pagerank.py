@@ -4,6 +4,8 @@ import re
 import sys
 import copy
 
+from cache import load_graph
+
 
 DAMPING = 0.85
 SAMPLES = 10000
@@ -15,7 +17,7 @@ def main():
     if len(sys.argv) != 2:
         sys.exit("Usage: python pagerank.py corpus")
 
-    corpus = crawl(sys.argv[1]) # Call crawl function based in a directory that represents a collection of pages
+    corpus = load_graph(sys.argv[1]).to_corpus() # Load the links of a directory that represents a collection of pages, crawling only pages changed since the last run
     ranks = sample_pagerank(corpus, DAMPING, SAMPLES) # Calculate the pagerank of each page in corpus by sampling
 
     print(f"PageRank Results from Sampling (n = {SAMPLES})")
@@ -114,51 +116,38 @@ def sample_pagerank(corpus, damping_factor, n):
     """
 
     # Get all pages
-    base_pages: list = [page for page in corpus]
-
-    # Keep track of samples
-    samples: list = list()
+    base_pages: tuple = tuple(corpus)
 
-    # Keep track of probability
-    sample_probability: dict = dict()
+    # Links of each page, fixed once so every step is a constant time choice
+    outlinks: dict = {page: tuple(corpus[page]) for page in corpus}
 
-    # Get total number of pages in corpus
-    number_of_pages: int = len(corpus)
+    # Keep track of how many times each page was sampled
+    sample_count: dict = dict.fromkeys(base_pages, 0)
 
     # Define a random first page
-    random_index: int = random.randint(0, number_of_pages-1)
-    page: str = base_pages[random_index]
+    page: str = random.choice(base_pages)
 
     # Do sampling n times
     for num in range(n):
 
-        # Insert current page into sample
-        samples.append(page) 
-
-        # Add to the sample probability that the page appeared one more time
-        sample_probability[page] = sample_probability.get(page, 0) + 1
-
-        # Get the transition model of the current page
-        model = transition_model(corpus, page, damping_factor)
-        
-        # Get a list of pages and weights based in the model
-        pages = list()
-        weights = list()
-        for page in model:
-            weight = model[page]
-
-            pages.append(page)
-            weights.append(weight)
+        # Add to the sample count that the page appeared one more time
+        sample_count[page] += 1
 
-        # Choose a random page to go next
-        [page] = random.choices(pages, weights)
+        # Follow a link with probability damping_factor, otherwise jump to
+        # any page. A page without links links to every page, so it always
+        # jumps
+        links = outlinks[page]
+        if links and random.random() < damping_factor:
+            page = random.choice(links)
+        else:
+            page = random.choice(base_pages)
 
-    # Divede the number of times a page appeared by the number os samples
-    sample_size = len(samples)
+    # Divide the number of times a page appeared by the number of samples
     probability: dict[float] = {}
 
-    for page in sample_probability:
-        probability[page] = sample_probability[page]/sample_size
+    for page in sample_count:
+        if sample_count[page]:
+            probability[page] = sample_count[page]/n
 
     # Return samples
     return probability
@@ -0,0 +1,223 @@
+import collections
+import sys
+
+import numpy as np
+
+from cache import load_graph
+from graph import link_graph
+from pagerank import DAMPING
+from power import power_iterate
+
+# Residual left on a page per link once pushing stops
+EPSILON = 1e-4
+
+# Random walks run per unit of residual left after pushing
+WALKS = 10000
+
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 1000
+TOP = 10
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python personalized.py corpus page [page ...]")
+
+    graph = load_graph(sys.argv[1])
+    for page in sys.argv[2:]:
+        if page not in graph.index:
+            sys.exit(f"No page {page} in corpus")
+
+    personalized = PersonalizedPageRank(graph, DAMPING)
+    print(f"Personalized PageRank for {', '.join(sys.argv[2:])}")
+    for page, rank in personalized.top_k(sys.argv[2:], TOP):
+        print(f"  {page}: {rank:.4f}")
+
+
+class PersonalizedPageRank():
+    """
+    Answers personalized PageRank queries on a corpus, where the random
+    surfer jumps to pages drawn from a teleport distribution instead of
+    uniformly, while still following a link with probability
+    `damping_factor` and leaving a page without links to any page.
+
+    Splitting off what reaches pages without links, each query is
+    x + c * spread, where x only depends on the pages around the teleport
+    distribution and `spread`, the ranks given to pages by surfers leaving
+    pages without links, is solved once for the whole corpus.
+    """
+
+    def __init__(self, corpus, damping_factor, tolerance=TOLERANCE,
+                 max_iterations=MAX_ITERATIONS):
+        self.graph = graph = link_graph(corpus)
+        self.damping_factor = damping_factor
+
+        # Ranks from uniform jumps where pages without links share nothing,
+        # a rescaling of the PageRank of the corpus
+        ranks, _ = power_iterate(graph, damping_factor, tolerance,
+                                 max_iterations)
+        dangling = ranks[graph.dangling].sum()
+        spread = ranks / (1 - damping_factor + damping_factor * dangling)
+        self.spread = spread
+        self.spread_dangling = spread[graph.dangling].sum()
+
+        # Pages by decreasing spread, to find the best pages x misses
+        self.order = np.argsort(-spread, kind="stable")
+
+    def local(self, teleport, epsilon=EPSILON, walks=WALKS, seed=None):
+        """
+        Estimates x for a teleport distribution by forward push until no
+        page holds more than `epsilon` residual per link, then finishes
+        the leftover residual with `walks` random walks per unit of it.
+        Returns a dictionary from page number to estimate.
+        """
+        graph = self.graph
+        d = self.damping_factor
+        outdegree = graph.outdegree
+
+        # Forward push, keeping (1 - d) of the residual at each page
+        estimate = collections.defaultdict(float)
+        residual = collections.defaultdict(float, teleport)
+        queue = collections.deque(residual)
+        queued = set(queue)
+        while queue:
+            i = queue.popleft()
+            queued.discard(i)
+            value = residual.pop(i)
+            estimate[i] += (1 - d) * value
+            links = graph.links(i)
+            if not len(links):
+                continue
+            share = d * value / len(links)
+            for j in links.tolist():
+                residual[j] += share
+                if j not in queued and \
+                        residual[j] > epsilon * max(outdegree[j], 1):
+                    queued.add(j)
+                    queue.append(j)
+
+        # Random walks from the residual, stopping with probability 1 - d
+        # and lost at pages without links, as pushing them would be
+        residual = {i: value for i, value in residual.items() if value > 0}
+        if residual and walks:
+            rng = np.random.default_rng(seed)
+            starts = np.array(list(residual), dtype=np.int64)
+            values = np.array(list(residual.values()))
+            counts = np.ceil(values * walks).astype(np.int64)
+            positions = np.repeat(starts, counts)
+            weights = np.repeat(values / counts, counts)
+            while len(positions):
+                stop = rng.random(len(positions)) >= d
+                for i, weight in zip(positions[stop].tolist(),
+                                     weights[stop].tolist()):
+                    estimate[i] += weight
+                degree = outdegree[positions]
+                alive = ~stop & (degree > 0)
+                positions, weights, degree = (
+                    positions[alive], weights[alive], degree[alive]
+                )
+                choice = (rng.random(len(positions)) * degree).astype(
+                    np.int64
+                )
+                positions = graph.targets[graph.offsets[positions] + choice]
+
+        return dict(estimate)
+
+    def combine(self, estimate):
+        """
+        Returns how much of `spread` completes an estimate of x: the rank
+        reaching pages without links is spread evenly, over and over.
+        """
+        dangling = self.graph.dangling
+        reached = sum(value for i, value in estimate.items() if dangling[i])
+        d = self.damping_factor
+        return d * reached / (1 - d * self.spread_dangling)
+
+    def ranks(self, seeds, **options):
+        """
+        Returns the approximate personalized PageRank of every page as a
+        dictionary, for seed pages or a teleport distribution.
+        """
+        estimate = self.local(self.teleport(seeds), **options)
+        vector = self.combine(estimate) * self.spread
+        for i, value in estimate.items():
+            vector[i] += value
+        return self.graph.ranks(vector)
+
+    def top_k(self, seeds, k=TOP, **options):
+        """
+        Returns the `k` pages of highest approximate personalized PageRank
+        for seed pages or a teleport distribution, as (page, rank) pairs.
+        """
+        estimate = self.local(self.teleport(seeds), **options)
+        scale = self.combine(estimate)
+
+        # Pages outside the estimate are ranked by spread alone
+        candidates = set(estimate)
+        candidates.update(self.order[:k + len(estimate)].tolist())
+        scores = [
+            (estimate.get(i, 0) + scale * self.spread[i], i)
+            for i in candidates
+        ]
+        pages = self.graph.pages
+        scores.sort(key=lambda score: (-score[0], pages[score[1]]))
+        return [(pages[i], float(score)) for score, i in scores[:k]]
+
+    def teleport(self, seeds):
+        """
+        Returns a teleport distribution as a dictionary from page number to
+        probability, given one page, a list of pages to jump to uniformly,
+        or a dictionary from page to weight.
+        """
+        if isinstance(seeds, str):
+            seeds = [seeds]
+        if not isinstance(seeds, dict):
+            seeds = dict.fromkeys(seeds, 1)
+        total = sum(seeds.values())
+        if not seeds or total <= 0:
+            raise ValueError("teleport distribution needs a positive weight")
+        return {
+            self.graph.index[page]: weight / total
+            for page, weight in seeds.items() if weight
+        }
+
+
+def personalized_pagerank(corpus, damping_factor, teleport,
+                          tolerance=TOLERANCE,
+                          max_iterations=MAX_ITERATIONS):
+    """
+    Return personalized PageRank values for each page by power iteration,
+    where random jumps land on pages drawn from `teleport`, a dictionary
+    from page to weight. Pages without links still link to every page.
+
+    Return a dictionary where keys are page names, and values are
+    their PageRank value. All PageRank values sum to 1.
+    """
+    graph = link_graph(corpus)
+    n = len(graph)
+    total = sum(teleport.values())
+    jump = np.zeros(n)
+    for page, weight in teleport.items():
+        jump[graph.index[page]] += weight / total
+
+    outdegree = graph.outdegree
+    ranks = jump.copy()
+    for _ in range(max_iterations):
+        share = np.divide(ranks, outdegree, out=np.zeros(n),
+                          where=outdegree > 0)
+        following = (1 - damping_factor) * jump + damping_factor * (
+            np.bincount(graph.targets, weights=share[graph.sources],
+                        minlength=n)
+            + ranks[graph.dangling].sum() / n
+        )
+        change = np.abs(following - ranks).sum()
+        ranks = following
+        if change < tolerance:
+            break
+    return graph.ranks(ranks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import sys
+import time
+
+import numpy as np
+
+from graph import link_graph
+from cache import load_graph
+from pagerank import DAMPING
+
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 1000
+
+# Blocks of pages updated in turn by a Gauss-Seidel sweep
+BLOCKS = 32
+
+# Fewest iterations between two extrapolations
+PERIOD = 10
+
+# Largest relative drift between successive ratios of the changes for
+# the iteration to be taken as converging geometrically
+STEADY = 0.05
+
+# Iterations in a row a page must barely move before it is left alone
+SETTLED = 3
+
+
+def main():
+
+    # Check for proper usage
+    if len(sys.argv) not in (2, 3) or (
+        len(sys.argv) == 3 and sys.argv[2] not in METHODS
+    ):
+        sys.exit(f"Usage: python power.py corpus [{'|'.join(METHODS)}]")
+
+    graph = load_graph(sys.argv[1])
+
+    # Without a method, compare every method on the corpus
+    if len(sys.argv) == 2:
+        print(f"{'method':<14}{'iterations':>11}{'seconds':>10}"
+              f"{'residual':>11}")
+        for method in METHODS:
+            ranks, iterations, elapsed = timed(graph, DAMPING, method)
+            print(f"{method:<14}{iterations:>11}{elapsed:>10.3f}"
+                  f"{residual(graph, ranks, DAMPING):>11.1e}")
+        return
+
+    method = sys.argv[2]
+    ranks, iterations, elapsed = timed(graph, DAMPING, method)
+    print(f"PageRank Results from {method} "
+          f"({iterations} iterations, {elapsed:.3f}s)")
+    ranks = graph.ranks(ranks)
+    for page in sorted(ranks):
+        print(f"  {page}: {ranks[page]:.4f}")
+
+
+def timed(graph, damping_factor, method):
+    """Solves with a method, returning ranks, iterations and seconds."""
+    start = time.perf_counter()
+    ranks, iterations = METHODS[method](graph, damping_factor)
+    return ranks, iterations, time.perf_counter() - start
+
+
+def power_pagerank(corpus, damping_factor, tolerance=TOLERANCE,
+                   max_iterations=MAX_ITERATIONS, method="power"):
+    """
+    Return PageRank values for each page by iterating over the sparse
+    link graph with `method`, until the ranks change by less than
+    `tolerance` in total from one iteration to the next.
+
+    `corpus` is a dictionary from each page to its links, or a LinkGraph.
+    Return a dictionary where keys are page names, and values are
+    their PageRank value. All PageRank values sum to 1.
+    """
+    graph = link_graph(corpus)
+    ranks, _ = METHODS[method](
+        graph, damping_factor, tolerance, max_iterations
+    )
+    return graph.ranks(ranks)
+
+
+def power_iterate(graph, damping_factor, tolerance=TOLERANCE,
+                  max_iterations=MAX_ITERATIONS):
+    """
+    Runs power iteration on a LinkGraph from uniform ranks.
+    Returns the rank vector and the number of iterations made.
+    """
+    n = len(graph)
+    ranks = np.full(n, 1 / n)
+    for iteration in range(1, max_iterations + 1):
+        following = step(graph, ranks, damping_factor)
+        change = np.abs(following - ranks).sum()
+        ranks = following
+        if change < tolerance:
+            break
+    return ranks, iteration
+
+
+def gauss_seidel(graph, damping_factor, tolerance=TOLERANCE,
+                 max_iterations=MAX_ITERATIONS):
+    """
+    Runs block Gauss-Seidel sweeps on a LinkGraph from uniform ranks.
+    Every block of pages is updated from the ranks the previous blocks
+    of the same sweep have just computed, rather than from the last sweep.
+    Returns the rank vector and the number of sweeps made.
+    """
+    n = len(graph)
+    reverse = graph.reverse()
+    outdegree = graph.outdegree
+    dangling = graph.dangling
+    bounds = np.linspace(0, n, min(BLOCKS, n) + 1).astype(np.int64)
+
+    ranks = np.full(n, 1 / n)
+    for iteration in range(1, max_iterations + 1):
+        previous = ranks.copy()
+        share = np.divide(ranks, outdegree, out=np.zeros(n), where=~dangling)
+        spread = ranks[dangling].sum()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+
+            # Links into the block, as the links of the reversed graph
+            first, last = reverse.offsets[start], reverse.offsets[end]
+            following = np.bincount(
+                reverse.sources[first:last] - start,
+                weights=share[reverse.targets[first:last]],
+                minlength=end - start
+            )
+            following = (1 - damping_factor) / n + damping_factor * (
+                following + spread / n
+            )
+
+            # Later blocks see the new ranks straight away
+            block = slice(start, end)
+            spread += (following - ranks[block])[dangling[block]].sum()
+            ranks[block] = following
+            share[block] = np.divide(
+                following, outdegree[block],
+                out=np.zeros(end - start), where=~dangling[block]
+            )
+
+        # Sweeps do not keep the total rank at 1, so rescale it each time
+        ranks /= ranks.sum()
+        if np.abs(ranks - previous).sum() < tolerance:
+            break
+    return ranks, iteration
+
+
+def quadratic(graph, damping_factor, tolerance=TOLERANCE,
+              max_iterations=MAX_ITERATIONS):
+    """Runs power iteration with periodic quadratic extrapolation."""
+    return extrapolated(graph, damping_factor, tolerance, max_iterations,
+                        quadratic_extrapolation, 4)
+
+
+def extrapolated(graph, damping_factor, tolerance, max_iterations,
+                 extrapolate, history):
+    """
+    Runs power iteration from uniform ranks, replacing the ranks with an
+    extrapolation from the last `history` ones, at most every PERIOD
+    iterations, while the changes between them shrink geometrically.
+    A guess that one step moves more than the ranks it replaced would
+    have moved is thrown away.
+    Returns the rank vector and the number of iterations made.
+    """
+    n = len(graph)
+    ranks = np.full(n, 1 / n)
+    recent = [ranks]
+    changes = []
+    since = 0
+
+    # Ranks replaced by an untried guess, with their history and how far
+    # a step should move them
+    replaced = None
+    for iteration in range(1, max_iterations + 1):
+        following = step(graph, ranks, damping_factor)
+        change = np.abs(following - ranks).sum()
+        if change < tolerance:
+            ranks = following
+            break
+
+        if replaced is not None:
+            previous, expected = replaced
+            replaced = None
+            if change > expected:
+                ranks, recent, changes = previous
+                continue
+
+        ranks = following
+        recent = recent[1 - history:] + [ranks]
+        changes = changes[-2:] + [change]
+        since += 1
+        if since < PERIOD or len(recent) < history or len(changes) < 3:
+            continue
+
+        # Extrapolate only while each change is the last one shrunk by a
+        # steady ratio, as the extrapolation assumes
+        ratio = changes[2] / changes[1]
+        drift = abs(ratio - changes[1] / changes[0])
+        if ratio >= 1 or drift > STEADY * ratio:
+            continue
+
+        # Keep the guess only as a distribution
+        guess = np.maximum(extrapolate(*recent), 0)
+        if guess.sum() > 0:
+            replaced = ((ranks, recent, changes), change * ratio)
+            ranks = guess / guess.sum()
+            recent = [ranks]
+            changes = []
+            since = 0
+    return ranks, iteration
+
+
+def quadratic_extrapolation(x0, x1, x2, x3):
+    """
+    Estimates the limit of four successive iterates, assuming their error
+    lies mostly along the two slowest eigenvectors of the link matrix.
+    """
+    y = np.stack([x1 - x0, x2 - x0], axis=1)
+    gamma, *_ = np.linalg.lstsq(y, x0 - x3, rcond=None)
+    return ((gamma[0] + gamma[1] + 1) * x1 + (gamma[1] + 1) * x2 + x3)
+
+
+def adaptive(graph, damping_factor, tolerance=TOLERANCE,
+             max_iterations=MAX_ITERATIONS):
+    """
+    Runs power iteration from uniform ranks, no longer updating a page
+    once its rank has settled for SETTLED iterations in a row. When the
+    pages still moving barely change, a full step checks the ranks as a
+    whole, and the pages it still moves are updated again.
+    Returns the rank vector and the number of iterations made.
+    """
+    n = len(graph)
+    outdegree = graph.outdegree
+    dangling = graph.dangling
+    indegree = np.bincount(graph.targets, minlength=n)
+
+    ranks = np.full(n, 1 / n)
+    calm = np.zeros(n, dtype=np.int64)
+
+    # Pages still moving, or None while every page is updated
+    pages = None
+    for iteration in range(1, max_iterations + 1):
+        if pages is None:
+            following = step(graph, ranks, damping_factor)
+            change = np.abs(following - ranks)
+            ranks = following
+            if change.sum() < tolerance:
+                break
+
+            # A page has settled when it moves by less than its share of
+            # the tolerance, so every page settling is the same test as
+            # power iteration stopping
+            calm += 1
+            calm[change >= tolerance * ranks] = 0
+            moving = np.flatnonzero(calm < SETTLED)
+        else:
+            following = np.bincount(
+                positions, weights=ranks[sources] / shares,
+                minlength=len(pages)
+            )
+            following = (1 - damping_factor) / n + damping_factor * (
+                following + spread / n
+            )
+            change = np.abs(following - ranks[pages])
+            spread += (following - ranks[pages])[dangling[pages]].sum()
+            ranks[pages] = following
+            calm[pages] = np.where(change < tolerance * following,
+                                   calm[pages] + 1, 0)
+            moving = pages[calm[pages] < SETTLED]
+
+        # Go back to full steps to check the ranks once the pages still
+        # moving change by less than the tolerance, and only gather the
+        # links into the pages still moving once they need at most half
+        # the links read in this step
+        if not len(moving) or pages is not None and (
+            change.sum() < tolerance
+        ):
+            pages = None
+        elif 2 * indegree[moving].sum() <= (
+            graph.edges if pages is None else len(sources)
+        ):
+
+            # Narrow down the links kept for the pages moving before
+            if pages is None:
+                sources, targets = graph.sources, graph.targets
+            position = np.full(n, -1)
+            position[moving] = np.arange(len(moving))
+            positions = position[targets]
+            keep = positions >= 0
+            sources, targets = sources[keep], targets[keep]
+            positions = positions[keep]
+            shares = outdegree[sources]
+            spread = ranks[dangling].sum()
+            pages = moving
+    return ranks / ranks.sum(), iteration
+
+
+def residual(graph, ranks, damping_factor):
+    """Returns how much one step of the random surfer changes the ranks."""
+    return np.abs(step(graph, ranks, damping_factor) - ranks).sum()
+
+
+def step(graph, ranks, damping_factor):
+    """
+    Returns the ranks after one step of the random surfer, which is one
+    product with the column-stochastic link matrix.
+    """
+    n = len(graph)
+    outdegree = graph.outdegree
+
+    # Each page shares its rank equally among its links
+    share = np.divide(ranks, outdegree, out=np.zeros(n), where=outdegree > 0)
+    following = np.bincount(
+        graph.targets, weights=share[graph.sources], minlength=n
+    )
+
+    # A page without links links to every page, including itself, so its
+    # rank is spread evenly without storing those links
+    spread = ranks[graph.dangling].sum() / n
+    return (1 - damping_factor) / n + damping_factor * (following + spread)
+
+
+# Solvers by name, each returning the rank vector and iterations made
+METHODS = {
+    "power": power_iterate,
+    "gauss-seidel": gauss_seidel,
+    "quadratic": quadratic,
+    "adaptive": adaptive,
+}
+
+
+if __name__ == "__main__":
+    main()